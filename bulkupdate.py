@@ -32,7 +32,7 @@ from opensearch_base_manager import OpenSearchBaseManager, OpenSearchException
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from queue import Queue
 import threading
-from file_processor import FileProcessor
+from file_processor import FileProcessor, get_file_type
 from datetime import datetime
 
 # Load environment variables
@@ -236,12 +236,8 @@ class OpenSearchBulkIngestion(OpenSearchBaseManager):
             return file_info.get("file_path", "")
 
     def _determine_file_type(self, file_path):
-        """Determine file type based on extension."""
-        if file_path.lower().endswith('.json'):
-            return "json"
-        elif file_path.lower().endswith('.csv'):
-            return "csv"
-        return "unknown"
+        """Determine file type based on extension, ignoring a trailing .gz."""
+        return get_file_type(file_path) or "unknown"
         
     def _process_file_info(self, file_info: Dict[str, Any], index_name: str, processed_files: List[str], resume: bool) -> Tuple[int, int, Dict[str, Any]]:
         """Process a single file and return its results."""
@@ -8,11 +8,13 @@ and prepare them for ingestion into OpenSearch.
 import os
 import logging
 import boto3
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Union, IO, Callable
 import pandas as pd
-from io import StringIO
+from io import StringIO, TextIOWrapper
+import gzip
 import json
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from queue import Queue
 import threading
 import time
@@ -23,8 +25,31 @@ from opensearch_base_manager import OpenSearchBaseManager
 # Load environment variables
 load_dotenv()
 
+# Constants
+FILE_TYPE_BY_EXTENSION = {'.csv': 'csv', '.json': 'json'}
+# Shared encoder for bulk request bodies (same output as json.dumps defaults)
+JSON_ENCODER = json.JSONEncoder()
+# Bulk bodies smaller than this are sent uncompressed
+BULK_COMPRESSION_MIN_BYTES = 4096
+
 logger = logging.getLogger(__name__)
 
+
+def get_file_type(file_name: str) -> Optional[str]:
+    """
+    Map a file name to its input type, ignoring a trailing .gz suffix.
+
+    Args:
+        file_name (str): File name, path or S3 key
+
+    Returns:
+        Optional[str]: 'csv' or 'json', or None for unsupported files
+    """
+    name = file_name.lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    return FILE_TYPE_BY_EXTENSION.get(os.path.splitext(name)[1])
+
 class FileProcessor:
     """
     Handles file processing from different sources (local and S3).
@@ -47,6 +72,9 @@ class FileProcessor:
         self._lock = threading.Lock()
         self.opensearch_manager = OpenSearchBaseManager()
         
+        # Check if gzip compression of bulk request bodies is enabled
+        self.bulk_compression = os.getenv('BULK_COMPRESSION', 'disabled').lower() == 'enabled'
+        
         # Check if DLQ is enabled
         self.dlq_enabled = os.getenv('DLQ', 'disabled').lower() == 'enabled'
         
@@ -77,13 +105,18 @@ class FileProcessor:
         Returns:
             tuple: (csv_files, json_files)
         """
-        # Get all files in the folder
-        all_files = [os.path.join(folder_path, f) for f in os.listdir(folder_path) 
-                    if os.path.isfile(os.path.join(folder_path, f))]
+        files_by_type = {'csv': [], 'json': []}
+        
+        # Bucket files by extension in a single pass over the folder;
+        # DirEntry.is_file() reuses the type info from the directory read
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                file_type = get_file_type(entry.name)
+                if file_type and entry.is_file():
+                    files_by_type[file_type].append(entry.path)
         
-        # Filter for CSV and JSON files
-        csv_files = [f for f in all_files if f.lower().endswith('.csv')]
-        json_files = [f for f in all_files if f.lower().endswith('.json')]
+        csv_files = files_by_type['csv']
+        json_files = files_by_type['json']
         
         logger.info(f"Found {len(csv_files)} CSV files and {len(json_files)} JSON files in folder {folder_path}")
         return csv_files, json_files
@@ -161,9 +194,10 @@ class FileProcessor:
                 found_any_contents = True
                 for obj in page['Contents']:
                     key = obj['Key']
-                    if key.lower().endswith('.csv'):
+                    file_type = get_file_type(key)
+                    if file_type == 'csv':
                         csv_files.append({"bucket": bucket, "key": key, "type": "csv", "size": obj.get('Size', 0)})
-                    elif key.lower().endswith('.json'):
+                    elif file_type == 'json':
                         json_files.append({"bucket": bucket, "key": key, "type": "json", "size": obj.get('Size', 0)})
                     else:
                         logger.debug(f"Skipping non-CSV/JSON file: {key}")
@@ -232,6 +266,71 @@ class FileProcessor:
         
         return document
 
+    def _prepare_columns(self, frame: pd.DataFrame) -> Tuple[Tuple[str, ...], List[List[Any]]]:
+        """
+        Convert every column of a frame into plain Python values.
+        
+        Uses the same rules as _create_document: numeric values become floats,
+        other values are stripped strings and missing values become None.
+        Numeric-dtype columns are converted in one step; object columns, which
+        can mix numbers, booleans and strings, are converted value by value.
+        The missing-value mask is computed once per column rather than per cell.
+        
+        Args:
+            frame (pd.DataFrame): CSV rows to convert
+            
+        Returns:
+            tuple: (column names, list of converted values for each column)
+        """
+        columns = tuple(frame.columns)
+        column_values = []
+        for column in columns:
+            series = frame[column]
+            missing = series.isna().tolist()
+            if pd.api.types.is_numeric_dtype(series.dtype):
+                values = series.astype(float).tolist()
+                column_values.append([None if is_missing else value for value, is_missing in zip(values, missing)])
+            else:
+                values = series.tolist()
+                column_values.append([None if is_missing else self._convert_value(value) for value, is_missing in zip(values, missing)])
+        return columns, column_values
+
+    def _convert_value(self, value: Any) -> Any:
+        """
+        Convert a single non-missing value with the _create_document rules.
+        
+        Args:
+            value (Any): Value read from an object column
+            
+        Returns:
+            Any: float for numeric values, otherwise the stripped string
+        """
+        if pd.api.types.is_numeric_dtype(type(value)):
+            return float(value)
+        return str(value).strip()
+
+    def _build_document_factory(self, columns: Tuple[str, ...]) -> Callable[[Tuple[Any, ...]], Dict[str, Any]]:
+        """
+        Build a function that turns a row tuple into a document for a fixed set of columns.
+        
+        The function is generated once per file schema as a single dict literal,
+        so each row is built without a per-column loop. Column names are embedded
+        with repr() and never evaluated as code.
+        
+        Args:
+            columns (Tuple[str, ...]): Column names in row order
+            
+        Returns:
+            Callable: Function mapping a row tuple to a document
+        """
+        if not all(isinstance(column, str) for column in columns):
+            return lambda row: dict(zip(columns, row))
+        
+        fields = ", ".join(f"{column!r}: row[{i}]" for i, column in enumerate(columns))
+        namespace = {}
+        exec(f"def make_document(row):\n    return {{{fields}}}\n", namespace)
+        return namespace['make_document']
+
     def _create_bulk_request(self, documents: List[Dict[str, Any]], index_name: str) -> str:
         """
         Create bulk request body in NDJSON format.
@@ -243,21 +342,19 @@ class FileProcessor:
         Returns:
             str: NDJSON formatted bulk request body
         """
+        encode = JSON_ENCODER.encode
+        # The action line only varies by document ID, so serialize the index name once
+        action_prefix = '{"index": {"_index": ' + encode(index_name)
+        action_no_id = action_prefix + '}}'
+        
         bulk_request = []
         for doc in documents:
-            # Use the 'id' field from the document if it exists
-            index_action = {
-                "index": {
-                    "_index": index_name
-                }
-            }
-            
             # Add the document ID if it exists in the document
             if "id" in doc:
-                index_action["index"]["_id"] = doc["id"]
-                
-            bulk_request.append(json.dumps(index_action))
-            bulk_request.append(json.dumps(doc))
+                bulk_request.append(action_prefix + ', "_id": ' + encode(doc["id"]) + '}}')
+            else:
+                bulk_request.append(action_no_id)
+            bulk_request.append(encode(doc))
         return '\n'.join(bulk_request) + '\n'
 
     def _send_error_to_sqs(self, error_payload: Dict[str, Any]) -> bool:
@@ -428,8 +525,16 @@ class FileProcessor:
             # Create bulk request
             bulk_request = self._create_bulk_request(batch, index_name)
             
+            # Compress larger bodies; NDJSON with repeated field names shrinks well even at the fastest level
+            headers = {'Content-Type': 'application/x-ndjson'}
+            if self.bulk_compression:
+                body = bulk_request.encode('utf-8')
+                if len(body) >= BULK_COMPRESSION_MIN_BYTES:
+                    bulk_request = gzip.compress(body, compresslevel=1)
+                    headers['Content-Encoding'] = 'gzip'
+            
             # Send request
-            result = self._make_request('POST', '/_bulk', data=bulk_request, headers={'Content-Type': 'application/x-ndjson'})
+            result = self._make_request('POST', '/_bulk', data=bulk_request, headers=headers)
           
             # Check for errors
             if result['status'] != 'success':
@@ -501,38 +606,35 @@ class FileProcessor:
                     pass
                 break
 
-    def _process_csv_file(self, content: str, file_path: str) -> int:
-        """Process CSV file content and return number of rows processed."""
-        df = pd.read_csv(StringIO(content))
+    def _process_csv_file(self, content: Union[str, IO[str]], file_path: str) -> int:
+        """Process CSV file content (text or text stream) and return number of rows processed."""
+        df = pd.read_csv(StringIO(content) if isinstance(content, str) else content)
         logger.info(f"Found {len(df.columns)} columns in file: {file_path}")
         
-        batch = []
-        row_count = 0
+        row_count = len(df)
         
-        for _, row in df.iterrows():
-            row_count += 1
-            try:
-                document = self._create_document(row)
-                batch.append(document)
-                
-                if len(batch) >= self.batch_size:
-                    logger.info(f"Putting batch of {len(batch)} documents into queue")
-                    self._batch_queue.put(batch.copy())
-                    batch = []
-                    time.sleep(0.1)
-                    
-            except (ValueError, KeyError) as e:
-                logger.error(f"Error processing row {row_count} in file {file_path}: {str(e)}")
+        # Convert the columns once for the whole file, then build each batch right before queueing it
+        columns, column_values = self._prepare_columns(df)
+        make_document = self._build_document_factory(columns)
+        rows = zip(*column_values)
         
-        if batch:
-            logger.info(f"Putting the lasts batch of {len(batch)} documents into queue")
+        for _ in range(0, row_count, self.batch_size):
+            batch = [make_document(row) for row in islice(rows, self.batch_size)]
+            
+            logger.info(f"Putting batch of {len(batch)} documents into queue")
             self._batch_queue.put(batch)
+            if len(batch) >= self.batch_size:
+                time.sleep(0.1)
             
         return row_count
 
-    def _process_json_file(self, content: str, file_path: str) -> int:
-        """Process JSON file content and return number of rows processed."""
-        data = json.loads(content)
+    def _process_json_file(self, content: Union[str, IO[str]], file_path: str) -> int:
+        """
+        Process JSON file content (text or text stream) and return number of rows processed.
+        
+        A stream is read in full before parsing, since the file is a single JSON document.
+        """
+        data = json.loads(content) if isinstance(content, str) else json.load(content)
         if isinstance(data, dict):
             data = [data]
             
@@ -557,9 +659,19 @@ class FileProcessor:
             
         return row_count
 
-    def _get_file_content(self, file_info: Dict[str, Any]) -> Tuple[str, str, str]:
-        """Get file content and return (content, file_path, file_type)."""
+    def _get_file_content(self, file_info: Dict[str, Any]) -> Tuple[Union[str, IO[str]], str, str]:
+        """
+        Get file content and return (content, file_path, file_type).
+        
+        Gzip-compressed files (.gz suffix or S3 ContentEncoding of gzip) are
+        returned as a decompressing text stream instead of a fully decoded string.
+        Only CSV input benefits: pandas parses it straight from the stream, so the
+        decompressed text is never held as one string. json.load reads the whole
+        decompressed text, so compressed JSON gets no memory saving.
+        """
         file_type = file_info.get("type", "")
+        if not file_type:
+            raise ValueError(f"Invalid file information: {file_info}")
         
         if "bucket" in file_info and "key" in file_info:
             bucket = file_info["bucket"]
@@ -567,17 +679,20 @@ class FileProcessor:
             file_path = f"{bucket}/{key}"
             logger.info(f"Processing S3 file: {file_path}")
             response = self.s3_client.get_object(Bucket=bucket, Key=key)
-            content = response['Body'].read().decode('utf-8')
+            if key.lower().endswith('.gz') or response.get('ContentEncoding') == 'gzip':
+                content = TextIOWrapper(gzip.GzipFile(fileobj=response['Body']), encoding='utf-8')
+            else:
+                content = response['Body'].read().decode('utf-8')
         else:
             file_path = file_info.get("file_path", "")
             if not file_path:
                 raise ValueError(f"Invalid file information: {file_info}")
             logger.info(f"Processing local file: {file_path}")
-            with open(file_path, 'r') as f:
-                content = f.read()
-                
-        if not file_type:
-            raise ValueError(f"Invalid file information: {file_info}")
+            if file_path.lower().endswith('.gz'):
+                content = gzip.open(file_path, 'rt', encoding='utf-8')
+            else:
+                with open(file_path, 'r') as f:
+                    content = f.read()
             
         return content, file_path, file_type
 
@@ -604,13 +719,17 @@ class FileProcessor:
             logger.info(f"Processing {file_type.upper()} file: {file_path}")
             
             file_row_count = 0
-            if file_type.lower() == 'csv':
-                file_row_count = self._process_csv_file(content, file_path)
-            elif file_type.lower() == 'json':
-                file_row_count = self._process_json_file(content, file_path)
-            else:
-                logger.error(f"Unsupported file type: {file_type}")
-                return 0, 0
+            try:
+                if file_type.lower() == 'csv':
+                    file_row_count = self._process_csv_file(content, file_path)
+                elif file_type.lower() == 'json':
+                    file_row_count = self._process_json_file(content, file_path)
+                else:
+                    logger.error(f"Unsupported file type: {file_type}")
+                    return 0, 0
+            finally:
+                if not isinstance(content, str):
+                    content.close()
             
             # Process batches
             with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
@@ -2,12 +2,14 @@
 echo Running OpenSearch Ingestion Tests...
 
 REM Install coverage if not already installed
-pip install coverage pytest pytest-cov
+pip install coverage pytest pytest-cov pytest-xdist
 
 REM Run tests with coverage
+REM Tests that failed last run go first (--ff); extra arguments are passed
+REM through, e.g. "run_tests.bat --lf" to rerun only the previous failures
 echo.
 echo Running tests with coverage...
-python -m pytest tests/ --cov=. --cov-report=xml --cov-report=term-missing --junitxml=test-results.xml
+python -m pytest tests/ -n auto --dist loadfile --ff --cov=. --cov-report=xml --cov-report=term-missing --junitxml=test-results.xml %*
 
 echo.
 echo All tests completed.
@@ -0,0 +1,21 @@
+"""
+Test doubles shared by the test modules.
+"""
+
+
+class _FakeResponse:
+    """Typed stand-in for requests.Response exposing only what the code under test reads."""
+
+    __slots__ = ('status_code', 'payload', 'text', 'headers')
+
+    def __init__(self, status_code=200, payload=None, text='', headers=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.text = text
+        self.headers = {} if headers is None else headers
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        return None
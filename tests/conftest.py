@@ -0,0 +1,14 @@
+"""
+Shared pytest configuration for the test suite.
+
+Puts the project root on sys.path so the top-level modules can be imported
+when pytest is invoked directly (``pytest tests/``) and not only through
+``python -m pytest``.
+"""
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
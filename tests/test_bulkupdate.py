@@ -237,6 +237,10 @@ class TestOpenSearchBulkIngestion(unittest.TestCase):
         file_type = self.ingestion_manager._determine_file_type('test.json')
         self.assertEqual(file_type, 'json')
         
+        # Test gzip-compressed CSV file
+        file_type = self.ingestion_manager._determine_file_type('test.csv.gz')
+        self.assertEqual(file_type, 'csv')
+        
         # Test unknown file type
         file_type = self.ingestion_manager._determine_file_type('test.txt')
         self.assertEqual(file_type, 'unknown')
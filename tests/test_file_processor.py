@@ -6,63 +6,125 @@ local and S3 file handling, batch processing, and document creation.
 """
 
 import unittest
-from unittest.mock import patch, MagicMock, call
-import json
+import concurrent.futures
+from unittest.mock import patch, Mock, DEFAULT
 import os
-import pandas as pd
-from io import StringIO
+import io
+import gzip
+import tempfile
+from queue import Queue
 from file_processor import FileProcessor
+from tests._fakes import _FakeResponse
+
+# Shared test inputs
+CSV_SMALL = "id,name,value\n1,test1,100\n2,test2,200\n3,test3,300"
+CSV_BATCH = "id,name,value\n" + "\n".join(f"{i},test{i},{i*100}" for i in range(1, 8))
+CSV_INVALID = "id,name,value\n1,test1,100\n2,test2,invalid\n3,test3,300"
+DOCUMENTS = [
+    {'id': 1, 'name': 'test1'},
+    {'id': 2, 'name': 'test2'}
+]
+# Batch large enough to be gzip-compressed before sending
+LARGE_BATCH = [{'id': i, 'name': f'test{i}', 'description': 'x' * 100} for i in range(50)]
+# Successful bulk responses for DOCUMENTS and LARGE_BATCH
+BULK_OK_PAYLOAD = {'errors': False, 'items': [{'index': {'status': 200}}] * len(DOCUMENTS)}
+LARGE_BULK_OK_PAYLOAD = {'errors': False, 'items': [{'index': {'status': 200}}] * len(LARGE_BATCH)}
+
+
+class _FakeS3:
+    """Lightweight stand-in for the boto3 S3 client used by the listing tests."""
+
+    def __init__(self, pages=None, error=None):
+        self._pages = pages or []
+        self._error = error
+
+    def get_paginator(self, n):
+        if self._error:
+            raise self._error
+        return self
+
+    def paginate(self, **kwargs):
+        return iter(self._pages)
+
+
+class _QSpy:
+    """List-backed stand-in for the batch queue that records each put."""
+
+    def __init__(self):
+        self.puts = []
+
+    def put(self, b):
+        self.puts.append(b)
+
+
+class _SyncExecutor:
+    """Executor stand-in that runs submitted work inline on the calling thread."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def submit(self, fn, *args, **kwargs):
+        future = concurrent.futures.Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+def _mk_count_process_batch(proc):
+    """Build a _process_batch replacement that only counts the documents it receives."""
+    def f(b, i, fn):
+        proc._processed_count_from_bulk += len(b)
+        return True
+    return f
+
 
 class TestFileProcessor(unittest.TestCase):
     """Test cases for the FileProcessor class."""
     
-    def setUp(self):
-        """Set up test environment."""
-        # Create a mock for boto3.client
-        self.s3_client_mock = MagicMock()
-        
-        # Create mock for OpenSearch connection
-        self.opensearch_mock = MagicMock()
-        self.opensearch_mock.info.return_value = {'version': {'number': '7.10.2'}}
-        self.opensearch_mock.indices.exists.return_value = True
-        self.opensearch_mock.indices.get.return_value = {'test-index': {'mappings': {}}}
-        self.opensearch_mock.indices.stats.return_value = {'indices': {'test-index': {'total': {'docs': {'count': 0}}}}}
-        self.opensearch_mock.bulk.return_value = {'errors': False, 'items': []}
-        
-        # Create mock for requests
-        self.requests_mock = MagicMock()
-        self.requests_mock.get.return_value = MagicMock(
-            status_code=200,
-            json=lambda: {'version': {'number': '7.10.2'}}
-        )
-        self.requests_mock.get.return_value.raise_for_status = MagicMock()
-        
-        # Apply patches
-        self.boto3_patcher = patch('boto3.client', return_value=self.s3_client_mock)
-        self.opensearch_patcher = patch('opensearchpy.OpenSearch', return_value=self.opensearch_mock)
-        self.requests_patcher = patch('requests.get', return_value=self.requests_mock.get.return_value)
-        
-        self.boto3_patcher.start()
-        self.opensearch_patcher.start()
-        self.requests_patcher.start()
+    @classmethod
+    def setUpClass(cls):
+        """Patch dependencies and build the processor once for the whole test class."""
+        cls.s3_client = _FakeS3()
+        cls.boto3_patcher = patch('boto3.client', return_value=cls.s3_client)
+        cls.boto3_patcher.start()
+        cls.addClassCleanup(cls.boto3_patcher.stop)
+        
+        # Successful OpenSearch connection check
+        cls.requests_patcher = patch('requests.get', return_value=_FakeResponse(payload={'version': {'number': '7.10.2'}}))
+        cls.requests_patcher.start()
+        cls.addClassCleanup(cls.requests_patcher.stop)
         
         # Initialize the processor
-        self.processor = FileProcessor(batch_size=5, max_workers=2)
-        
-        # Create mock make_request function
-        self.mock_make_request = MagicMock(return_value={
-            'status': 'success',
-            'response': MagicMock(json=lambda: {'errors': False, 'items': []})
-        })
+        cls.processor = FileProcessor(batch_size=5, max_workers=2)
         
         # Set the OpenSearch endpoint to a dummy value since we're mocking
-        self.processor.opensearch_manager.opensearch_endpoint = 'https://dummy-opensearch-endpoint'
+        cls.processor.opensearch_manager.opensearch_endpoint = 'https://dummy-opensearch-endpoint'
+        
+        # Shared _make_request mock, reset before each test
+        cls.ok_response = {
+            'status': 'success',
+            'response': _FakeResponse(payload={'errors': False, 'items': []})
+        }
+        cls.mock_make_request = Mock(return_value=cls.ok_response)
     
-    def tearDown(self):
-        """Clean up after tests."""
-        self.boto3_patcher.stop()
-        self.opensearch_patcher.stop()
-        self.requests_patcher.stop()
+    def setUp(self):
+        """Reset per-test processor state."""
+        # Restore the shared S3 client stand-in
+        self.processor.s3_client = self.s3_client
+        
+        # Reset the state the tests mutate
+        self.processor._processed_count_from_bulk = 0
+        self.processor._batch_queue = Queue()
+        
+        # Reset the shared make_request mock and its default response
+        self.mock_make_request.reset_mock()
+        self.mock_make_request.return_value = self.ok_response
+        self.processor._make_request = self.mock_make_request
     
     def test_init(self):
         """Test initialization of the FileProcessor class."""
@@ -71,16 +133,13 @@ class TestFileProcessor(unittest.TestCase):
     
     def test_get_files_by_type(self):
         """Test getting files by type."""
-        # Mock os.listdir and os.path.isfile
-        with patch('os.listdir', return_value=['file1.csv', 'file2.json', 'file3.txt']):
-            with patch('os.path.isfile', return_value=True):
-                with patch('os.path.join', side_effect=lambda *args: '/'.join(args)):
-                    csv_files, json_files = self.processor._get_files_by_type('test-folder')
-                    
-                    self.assertEqual(len(csv_files), 1)
-                    self.assertEqual(len(json_files), 1)
-                    self.assertEqual(csv_files[0], 'test-folder/file1.csv')
-                    self.assertEqual(json_files[0], 'test-folder/file2.json')
+        with tempfile.TemporaryDirectory() as d:
+            for n in ('file1.csv', 'file2.json', 'file3.txt'):
+                open(os.path.join(d, n), 'w').close()
+            csv_files, json_files = self.processor._get_files_by_type(d)
+            
+            self.assertEqual(csv_files, [os.path.join(d, 'file1.csv')])
+            self.assertEqual(json_files, [os.path.join(d, 'file2.json')])
     
     def test_process_local_folder_success(self):
         """Test processing local folder successfully."""
@@ -119,14 +178,14 @@ class TestFileProcessor(unittest.TestCase):
     
     def test_process_s3_files_success(self):
         """Test processing S3 files successfully."""
-        # Mock the S3 client
-        self.s3_client_mock.get_paginator.return_value.paginate.return_value = [
+        # Fake the S3 client with a pre-baked page
+        self.processor.s3_client = _FakeS3([
             {'Contents': [
                 {'Key': 'file1.csv', 'Size': 100},
                 {'Key': 'file2.json', 'Size': 200},
                 {'Key': 'file3.txt', 'Size': 300}
             ]}
-        ]
+        ])
         
         result = self.processor.process_s3_files('test-bucket', 'test-prefix')
         
@@ -137,12 +196,12 @@ class TestFileProcessor(unittest.TestCase):
     
     def test_process_s3_files_no_files(self):
         """Test processing S3 files with no files."""
-        # Mock the S3 client
-        self.s3_client_mock.get_paginator.return_value.paginate.return_value = [
+        # Fake the S3 client with a pre-baked page
+        self.processor.s3_client = _FakeS3([
             {'Contents': [
                 {'Key': 'file3.txt', 'Size': 300}
             ]}
-        ]
+        ])
         
         result = self.processor.process_s3_files('test-bucket', 'test-prefix')
         
@@ -152,8 +211,8 @@ class TestFileProcessor(unittest.TestCase):
     
     def test_process_s3_files_error(self):
         """Test processing S3 files with an error."""
-        # Mock the S3 client to raise an exception
-        self.s3_client_mock.get_paginator.side_effect = Exception('Test error')
+        # Fake the S3 client to raise an exception
+        self.processor.s3_client = _FakeS3(error=Exception('Test error'))
         
         result = self.processor.process_s3_files('test-bucket', 'test-prefix')
         
@@ -163,14 +222,10 @@ class TestFileProcessor(unittest.TestCase):
     
     def test_create_document(self):
         """Test creating a document from a CSV row."""
-        # Create a test DataFrame row
-        df = pd.DataFrame({
-            'id': [1],
-            'name': ['test'],
-            'value': [42.5],
-            'empty': [None]
-        })
-        row = df.iloc[0]
+        import pandas as pd
+        
+        # Create a test row (_create_document reads row.index, so it needs a Series)
+        row = pd.Series({'id': 1, 'name': 'test', 'value': 42.5, 'empty': None})
         
         document = self.processor._create_document(row)
         
@@ -179,73 +234,87 @@ class TestFileProcessor(unittest.TestCase):
         self.assertEqual(document['value'], 42.5)
         self.assertIsNone(document['empty'])
     
+    def test_process_csv_file_matches_create_document(self):
+        """Test that CSV block conversion matches per-row document creation."""
+        import pandas as pd
+        
+        # The missing flag makes that column object dtype holding bools and NaN
+        content = "id,name,value,flag\n1, test ,42.5,True\n2,,,\n3,x,1,False"
+        spy = _QSpy()
+        self.processor._batch_queue = spy
+        
+        self.assertEqual(self.processor._process_csv_file(content, 'test.csv'), 3)
+        
+        documents = spy.puts[0]
+        df = pd.read_csv(io.StringIO(content))
+        self.assertEqual(documents, [self.processor._create_document(row) for _, row in df.iterrows()])
+        self.assertEqual(documents[0], {'id': 1.0, 'name': 'test', 'value': 42.5, 'flag': 1.0})
+        self.assertIsNone(documents[1]['name'])
+        self.assertIsNone(documents[1]['value'])
+        self.assertIsNone(documents[1]['flag'])
+        self.assertEqual(documents[2]['flag'], 0.0)
+        
+        # Mixed object column, as left by pandas' low-memory parse of large files
+        mixed = pd.DataFrame({'code': pd.Series([0, '0', ' a ', 2.5, None], dtype=object)})
+        columns, column_values = self.processor._prepare_columns(mixed)
+        self.assertEqual(column_values, [[0.0, '0', 'a', 2.5, None]])
+        self.assertEqual(
+            [dict(zip(columns, row)) for row in zip(*column_values)],
+            [self.processor._create_document(row) for _, row in mixed.iterrows()]
+        )
+    
+    def test_build_document_factory(self):
+        """Test that the generated document factory maps row tuples to documents."""
+        make_document = self.processor._build_document_factory(('id', "it's", 'a"b'))
+        
+        self.assertEqual(make_document((1.0, 'x', None)), {'id': 1.0, "it's": 'x', 'a"b': None})
+        self.assertEqual(self.processor._build_document_factory(())(()), {})
+    
     def test_create_bulk_request(self):
         """Test creating a bulk request."""
-        # Create test documents
-        documents = [
-            {'id': 1, 'name': 'test1'},
-            {'id': 2, 'name': 'test2'}
-        ]
-        
-        bulk_request = self.processor._create_bulk_request(documents, 'test-index')
-        
-        # Check that the bulk request is correctly formatted
-        lines = bulk_request.strip().split('\n')
-        self.assertEqual(len(lines), 4)  # 2 index actions + 2 documents
-        
-        # Check the index actions
-        index_action1 = json.loads(lines[0])
-        self.assertEqual(index_action1['index']['_index'], 'test-index')
-        self.assertEqual(index_action1['index']['_id'], 1)
-        
-        index_action2 = json.loads(lines[2])
-        self.assertEqual(index_action2['index']['_index'], 'test-index')
-        self.assertEqual(index_action2['index']['_id'], 2)
-        
-        # Check the documents
-        document1 = json.loads(lines[1])
-        self.assertEqual(document1['id'], 1)
-        self.assertEqual(document1['name'], 'test1')
-        
-        document2 = json.loads(lines[3])
-        self.assertEqual(document2['id'], 2)
-        self.assertEqual(document2['name'], 'test2')
+        bulk_request = self.processor._create_bulk_request(DOCUMENTS, 'test-index')
+        
+        # Compare against the exact NDJSON body: 2 index actions + 2 documents
+        self.assertEqual(bulk_request, (
+            '{"index": {"_index": "test-index", "_id": 1}}\n'
+            '{"id": 1, "name": "test1"}\n'
+            '{"index": {"_index": "test-index", "_id": 2}}\n'
+            '{"id": 2, "name": "test2"}\n'
+        ))
     
-    def test_process_file_csv(self):
+    @patch('file_processor.ThreadPoolExecutor', _SyncExecutor)
+    @patch.multiple(FileProcessor, _get_file_content=DEFAULT, _process_csv_file=DEFAULT)
+    def test_process_file_csv(self, _get_file_content, _process_csv_file):
         """Test processing a CSV file."""
-        # Mock the necessary functions
-        with patch.object(self.processor, '_get_file_content', return_value=('test content', 'test-file.csv', 'csv')):
-            with patch.object(self.processor, '_process_csv_file', return_value=10):
-                with patch('concurrent.futures.ThreadPoolExecutor') as executor_mock:
-                    executor_mock.return_value.__enter__.return_value.submit.return_value.result.return_value = None
-                    
-                    # Process the file
-                    rows_processed, processed_count = self.processor.process_file({
-                        'file_path': 'test-file.csv',
-                        'type': 'csv'
-                    }, 'test-index', lambda *args, **kwargs: {'status': 'success'})
-                    
-                    # Check that the correct number of rows were processed
-                    self.assertEqual(rows_processed, 10)
-                    self.assertEqual(processed_count, 0)  # Since we mocked the worker threads
+        _get_file_content.return_value = ('test content', 'test-file.csv', 'csv')
+        _process_csv_file.return_value = 10
+        
+        # Process the file
+        rows_processed, processed_count = self.processor.process_file({
+            'file_path': 'test-file.csv',
+            'type': 'csv'
+        }, 'test-index', lambda *args, **kwargs: {'status': 'success'})
+        
+        # Check that the correct number of rows were processed
+        self.assertEqual(rows_processed, 10)
+        self.assertEqual(processed_count, 0)  # No batches were queued
     
-    def test_process_file_json(self):
+    @patch('file_processor.ThreadPoolExecutor', _SyncExecutor)
+    @patch.multiple(FileProcessor, _get_file_content=DEFAULT, _process_json_file=DEFAULT)
+    def test_process_file_json(self, _get_file_content, _process_json_file):
         """Test processing a JSON file."""
-        # Mock the necessary functions
-        with patch.object(self.processor, '_get_file_content', return_value=('test content', 'test-file.json', 'json')):
-            with patch.object(self.processor, '_process_json_file', return_value=10):
-                with patch('concurrent.futures.ThreadPoolExecutor') as executor_mock:
-                    executor_mock.return_value.__enter__.return_value.submit.return_value.result.return_value = None
-                    
-                    # Process the file
-                    rows_processed, processed_count = self.processor.process_file({
-                        'file_path': 'test-file.json',
-                        'type': 'json'
-                    }, 'test-index', lambda *args, **kwargs: {'status': 'success'})
-                    
-                    # Check that the correct number of rows were processed
-                    self.assertEqual(rows_processed, 10)
-                    self.assertEqual(processed_count, 0)  # Since we mocked the worker threads
+        _get_file_content.return_value = ('test content', 'test-file.json', 'json')
+        _process_json_file.return_value = 10
+        
+        # Process the file
+        rows_processed, processed_count = self.processor.process_file({
+            'file_path': 'test-file.json',
+            'type': 'json'
+        }, 'test-index', lambda *args, **kwargs: {'status': 'success'})
+        
+        # Check that the correct number of rows were processed
+        self.assertEqual(rows_processed, 10)
+        self.assertEqual(processed_count, 0)  # No batches were queued
     
     def test_process_file_error(self):
         """Test error handling in process_file."""
@@ -253,51 +322,87 @@ class TestFileProcessor(unittest.TestCase):
         result = self.processor.process_file(file_info, "test-index", self.mock_make_request)
         self.assertEqual(result, (0, 0))
     
-    def test_process_batch_success(self):
-        """Test processing a batch successfully."""
-        # Set the _make_request attribute on the processor
-        self.processor._make_request = MagicMock()
+    def test_get_file_content_gzip_s3(self):
+        """Test that gzip-encoded S3 objects are returned as a text stream."""
+        self.processor.s3_client = Mock(spec_set=['get_object'])
+        self.processor.s3_client.get_object.return_value = {
+            'Body': io.BytesIO(gzip.compress(b"id,name\n1,test1\n2,test2")),
+            'ContentEncoding': 'gzip'
+        }
         
-        # Create a mock response with proper json method
-        mock_response = MagicMock()
-        mock_response.json.return_value = {'errors': False, 'items': [{'index': {'status': 200}}, {'index': {'status': 200}}]}
+        content, file_path, file_type = self.processor._get_file_content(
+            {'bucket': 'test-bucket', 'key': 'data.csv', 'type': 'csv'}
+        )
         
-        # Mock the _make_request function
-        with patch.object(self.processor, '_make_request', return_value={
+        self.assertEqual(file_path, 'test-bucket/data.csv')
+        self.assertEqual(file_type, 'csv')
+        self.assertNotIsInstance(content, str)
+        spy = _QSpy()
+        self.processor._batch_queue = spy
+        self.assertEqual(self.processor._process_csv_file(content, file_path), 2)
+        self.assertEqual(len(spy.puts[0]), 2)
+    
+    def test_process_local_gzip_csv(self):
+        """Test that a local .csv.gz file is found and processed as CSV."""
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'data.csv.gz')
+            with gzip.open(path, 'wt', encoding='utf-8') as f:
+                f.write(CSV_SMALL)
+            csv_files, json_files = self.processor._get_files_by_type(d)
+            self.assertEqual((csv_files, json_files), ([path], []))
+            
+            content, file_path, file_type = self.processor._get_file_content(
+                {'file_path': path, 'type': 'csv'}
+            )
+            spy = _QSpy()
+            self.processor._batch_queue = spy
+            with content:
+                self.assertEqual(self.processor._process_csv_file(content, file_path), 3)
+        
+        self.assertEqual(file_type, 'csv')
+        self.assertEqual(spy.puts[0][0], {'id': 1, 'name': 'test1', 'value': 100})
+    
+    def test_process_batch_success(self):
+        """Test processing a batch successfully."""
+        # Create a response stub with a successful bulk payload
+        mock_response = _FakeResponse(payload=BULK_OK_PAYLOAD)
+        self.mock_make_request.return_value = {
             'status': 'success',
             'response': mock_response
-        }):
-            # Create test batch
-            batch = [
-                {'id': 1, 'name': 'test1'},
-                {'id': 2, 'name': 'test2'}
-            ]
-            
-            result = self.processor._process_batch(batch, 'test-index', 'test-file')
-            
-            self.assertTrue(result)
-            self.assertEqual(self.processor._processed_count_from_bulk, 2)
+        }
+        
+        result = self.processor._process_batch(DOCUMENTS, 'test-index', 'test-file')
+        
+        self.assertTrue(result)
+        self.assertEqual(self.processor._processed_count_from_bulk, 2)
+    
+    def test_process_batch_compresses_large_payload(self):
+        """Test that large bulk bodies are gzip-compressed before sending."""
+        mock_response = _FakeResponse(payload=LARGE_BULK_OK_PAYLOAD)
+        self.mock_make_request.return_value = {'status': 'success', 'response': mock_response}
+        
+        with patch.object(self.processor, 'bulk_compression', True):
+            result = self.processor._process_batch(LARGE_BATCH, 'test-index', 'test-file')
+        
+        self.assertTrue(result)
+        kwargs = self.mock_make_request.call_args[1]
+        self.assertEqual(kwargs['headers']['Content-Encoding'], 'gzip')
+        self.assertEqual(
+            gzip.decompress(kwargs['data']).decode('utf-8'),
+            self.processor._create_bulk_request(LARGE_BATCH, 'test-index')
+        )
     
     def test_process_batch_error(self):
         """Test processing a batch with an error."""
-        # Set the _make_request attribute on the processor
-        self.processor._make_request = MagicMock()
-        
-        # Mock the _make_request function
-        with patch.object(self.processor, '_make_request', return_value={
+        self.mock_make_request.return_value = {
             'status': 'error',
             'message': 'Test error'
-        }):
-            # Create test batch
-            batch = [
-                {'id': 1, 'name': 'test1'},
-                {'id': 2, 'name': 'test2'}
-            ]
-            
-            result = self.processor._process_batch(batch, 'test-index', 'test-file')
-            
-            self.assertFalse(result)
-            self.assertEqual(self.processor._processed_count_from_bulk, 0)
+        }
+        
+        result = self.processor._process_batch(DOCUMENTS, 'test-index', 'test-file')
+        
+        self.assertFalse(result)
+        self.assertEqual(self.processor._processed_count_from_bulk, 0)
     
     def test_process_batch_worker(self):
         """Test the batch worker function."""
@@ -305,41 +410,25 @@ class TestFileProcessor(unittest.TestCase):
         self.processor._processed_count_from_bulk = 0
         
         # Add a batch to the queue
-        self.processor._batch_queue.put([
-            {'id': 1, 'name': 'test1'},
-            {'id': 2, 'name': 'test2'}
-        ])
+        self.processor._batch_queue.put(DOCUMENTS)
         
         # Add a None to signal the worker to stop
         self.processor._batch_queue.put(None)
         
-        # Mock the _make_request function
-        self.processor._make_request = MagicMock(return_value={
-            'status': 'success',
-            'response': MagicMock(json=lambda: {'errors': False, 'items': [{'index': {'status': 200}}, {'index': {'status': 200}}]})
-        })
-        
         # Mock the _process_batch function to update the counter
-        def mock_process_batch(batch, index_name, file_name):
-            self.processor._processed_count_from_bulk += len(batch)
-            return True
-            
-        with patch.object(self.processor, '_process_batch', side_effect=mock_process_batch):
+        with patch.object(self.processor, '_process_batch', side_effect=_mk_count_process_batch(self.processor)) as m:
             # Run the worker
             self.processor._process_batch_worker('test-index', 'test-file')
             
             # Check that the batch was processed
-            self.processor._process_batch.assert_called_once()
+            self.assertEqual(m.call_count, 1)
             self.assertEqual(self.processor._processed_count_from_bulk, 2)
     
-    def test_process_batch_with_failed_records(self):
+    @patch.object(FileProcessor, '_print_error_records')
+    def test_process_batch_with_failed_records(self, mock_print_errors):
         """Test processing a batch with failed records."""
-        # Set the _make_request attribute on the processor
-        self.processor._make_request = MagicMock()
-        
-        # Create a mock response with failed records
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
+        # Create a response stub with failed records
+        mock_response = _FakeResponse(payload={
             'errors': True,
             'items': [
                 {'index': {'status': 200, '_id': '1'}},
@@ -360,222 +449,125 @@ class TestFileProcessor(unittest.TestCase):
                     }
                 }}
             ]
-        }
+        })
         
-        # Mock the _make_request function
-        with patch.object(self.processor, '_make_request', return_value={
+        self.mock_make_request.return_value = {
             'status': 'success',
             'response': mock_response
-        }):
-            # Create test batch
-            batch = [
-                {'id': '1', 'name': 'test1'},
-                {'id': '2', 'name': 'test2'},
-                {'id': '3', 'name': 'test3'}
-            ]
-            
-            # Mock the _print_error_records method to verify it's called
-            with patch.object(self.processor, '_print_error_records') as mock_print_errors:
-                result = self.processor._process_batch(batch, 'test-index', 'test-file')
-                
-                # Verify the result
-                self.assertTrue(result)
-                self.assertEqual(self.processor._processed_count_from_bulk, 1)  # Only one successful record
-                
-                # Verify error records were collected and printed
-                mock_print_errors.assert_called_once()
-                call_args = mock_print_errors.call_args[0]
-                self.assertEqual(len(call_args[0]), 2)  # Two failed records
-                self.assertEqual(call_args[1], 'test-file')  # File name
-                
-                # Verify error record details
-                error_records = call_args[0]
-                self.assertEqual(error_records[0]['document_id'], '2')
-                self.assertEqual(error_records[0]['error_type'], 'mapper_parsing_exception')
-                self.assertEqual(error_records[1]['document_id'], '3')
-                self.assertEqual(error_records[1]['error_type'], 'internal_error')
+        }
+        
+        # Create test batch
+        batch = [
+            {'id': '1', 'name': 'test1'},
+            {'id': '2', 'name': 'test2'},
+            {'id': '3', 'name': 'test3'}
+        ]
+        
+        result = self.processor._process_batch(batch, 'test-index', 'test-file')
+        
+        # Verify the result
+        self.assertTrue(result)
+        self.assertEqual(self.processor._processed_count_from_bulk, 1)  # Only one successful record
+        
+        # Verify error records were collected and printed
+        mock_print_errors.assert_called_once()
+        call_args = mock_print_errors.call_args[0]
+        self.assertEqual(len(call_args[0]), 2)  # Two failed records
+        self.assertEqual(call_args[1], 'test-file')  # File name
+        
+        # Verify error record details
+        error_records = call_args[0]
+        self.assertEqual(error_records[0]['document_id'], '2')
+        self.assertEqual(error_records[0]['error_type'], 'mapper_parsing_exception')
+        self.assertEqual(error_records[1]['document_id'], '3')
+        self.assertEqual(error_records[1]['error_type'], 'internal_error')
     
-    def test_process_csv_file_success(self):
-        """Test successful CSV file processing."""
-        # Create test CSV content
-        csv_content = "id,name,value\n1,test1,100\n2,test2,200\n3,test3,300"
-        
-        # Mock the batch queue to verify documents are added
-        with patch.object(self.processor, '_batch_queue') as mock_queue:
-            # Process the CSV content
-            row_count = self.processor._process_csv_file(csv_content, 'test.csv')
-            
-            # Verify the row count
-            self.assertEqual(row_count, 3)
-            
-            # Verify that batches were added to the queue
-            # Since batch_size is 5 and we have 3 rows, only one batch should be added
-            mock_queue.put.assert_called_once()
-            batch = mock_queue.put.call_args[0][0]
-            self.assertEqual(len(batch), 3)
-            
-            # Verify document content
-            self.assertEqual(batch[0]['id'], 1)
-            self.assertEqual(batch[0]['name'], 'test1')
-            self.assertEqual(batch[0]['value'], 100)
-            
-    def test_process_csv_file_with_batching(self):
-        """Test CSV file processing with multiple batches."""
-        # Create test CSV content with more rows than batch size
-        csv_content = "id,name,value\n" + "\n".join([f"{i},test{i},{i*100}" for i in range(1, 8)])
-        
-        # Mock the batch queue to verify documents are added
-        with patch.object(self.processor, '_batch_queue') as mock_queue:
-            # Process the CSV content
-            row_count = self.processor._process_csv_file(csv_content, 'test.csv')
-            
-            # Verify the row count
-            self.assertEqual(row_count, 7)
-            
-            # Verify that two batches were added to the queue
-            # First batch should have 5 rows (batch_size)
-            # Second batch should have 2 rows
-            self.assertEqual(mock_queue.put.call_count, 2)
-            
-            # Verify first batch
-            first_batch = mock_queue.put.call_args_list[0][0][0]
-            self.assertEqual(len(first_batch), 5)
-            
-            # Verify second batch
-            second_batch = mock_queue.put.call_args_list[1][0][0]
-            self.assertEqual(len(second_batch), 2)
-            
-    def test_process_csv_file_error_handling(self):
-        """Test CSV file processing with error handling."""
-        # Create test CSV content with invalid data
-        csv_content = "id,name,value\n1,test1,100\n2,test2,invalid\n3,test3,300"
-        
-        # Mock the batch queue to verify documents are added
-        with patch.object(self.processor, '_batch_queue') as mock_queue:
-            # Process the CSV content
-            row_count = self.processor._process_csv_file(csv_content, 'test.csv')
-            
-            # Verify the row count (should count all rows)
-            self.assertEqual(row_count, 3)
-            
-            # Verify that all documents were added to the queue
-            mock_queue.put.assert_called_once()
-            batch = mock_queue.put.call_args[0][0]
-            self.assertEqual(len(batch), 3)  # All rows are processed
-            
-            # Verify document content
-            self.assertEqual(batch[0]['id'], 1)
-            self.assertEqual(batch[0]['name'], 'test1')
-            self.assertEqual(batch[0]['value'], '100')  # CSV values are read as strings
-            
-            # The invalid value should be converted to a string
-            self.assertEqual(batch[1]['id'], 2)
-            self.assertEqual(batch[1]['name'], 'test2')
-            self.assertEqual(batch[1]['value'], 'invalid')
-            
-            self.assertEqual(batch[2]['id'], 3)
-            self.assertEqual(batch[2]['name'], 'test3')
-            self.assertEqual(batch[2]['value'], '300')  # CSV values are read as strings
+    def test_process_csv_file(self):
+        """Test CSV file processing, including batching and mixed-type columns."""
+        # (content, expected row count, expected batch sizes); batch_size is 5
+        cases = [
+            (CSV_SMALL, 3, [3]),
+            (CSV_BATCH, 7, [5, 2]),
+            (CSV_INVALID, 3, [3]),
+        ]
+        puts_by_content = {}
+        for content, expected_rows, expected_batches in cases:
+            with self.subTest(expected_rows=expected_rows, expected_batches=expected_batches):
+                spy = _QSpy()
+                self.processor._batch_queue = spy
+                
+                self.assertEqual(self.processor._process_csv_file(content, 'test.csv'), expected_rows)
+                self.assertEqual([len(batch) for batch in spy.puts], expected_batches)
+                puts_by_content[content] = spy.puts
+        
+        # Verify document content
+        self.assertEqual(puts_by_content[CSV_SMALL][0][0], {'id': 1, 'name': 'test1', 'value': 100})
+        
+        # The invalid value makes the whole column strings
+        self.assertEqual(puts_by_content[CSV_INVALID], [[
+            {'id': 1, 'name': 'test1', 'value': '100'},
+            {'id': 2, 'name': 'test2', 'value': 'invalid'},
+            {'id': 3, 'name': 'test3', 'value': '300'}
+        ]])
 
     def test_process_json_file_success(self):
         """Test successful JSON file processing with multiple records."""
         # Create test JSON content with multiple records
         json_content = '[{"id": 1, "name": "test1"}, {"id": 2, "name": "test2"}, {"id": 3, "name": "test3"}]'
         
-        # Mock the batch queue to verify documents are added
-        with patch.object(self.processor, '_batch_queue') as mock_queue:
-            # Mock the OpenSearch bulk response
-            self.opensearch_mock.bulk.return_value = {
-                'errors': False,
-                'items': [
-                    {'index': {'status': 200, '_id': '1'}},
-                    {'index': {'status': 200, '_id': '2'}},
-                    {'index': {'status': 200, '_id': '3'}}
-                ]
-            }
-            
-            # Process the JSON content
-            row_count = self.processor._process_json_file(json_content, 'test.json')
-            
-            # Verify the row count
-            self.assertEqual(row_count, 3)
-            
-            # Verify that documents were added to the queue
-            mock_queue.put.assert_called_once()
-            batch = mock_queue.put.call_args[0][0]
-            self.assertEqual(len(batch), 3)
-            
-            # Verify document content
-            self.assertEqual(batch[0]['id'], 1)
-            self.assertEqual(batch[0]['name'], 'test1')
-            self.assertEqual(batch[1]['id'], 2)
-            self.assertEqual(batch[1]['name'], 'test2')
-            self.assertEqual(batch[2]['id'], 3)
-            self.assertEqual(batch[2]['name'], 'test3')
+        # Capture the batches added to the queue
+        spy = _QSpy()
+        self.processor._batch_queue = spy
+        
+        # Process the JSON content
+        row_count = self.processor._process_json_file(json_content, 'test.json')
+        
+        # Verify the row count
+        self.assertEqual(row_count, 3)
+        
+        # Verify that the documents were added to the queue in a single batch
+        self.assertEqual(spy.puts, [[
+            {'id': 1, 'name': 'test1'},
+            {'id': 2, 'name': 'test2'},
+            {'id': 3, 'name': 'test3'}
+        ]])
 
     def test_process_json_file_single_object(self):
         """Test JSON file processing with a single object."""
         # Create test JSON content with a single object
         json_content = '{"id": 1, "name": "test1"}'
         
-        # Mock the batch queue to verify documents are added
-        with patch.object(self.processor, '_batch_queue') as mock_queue:
-            # Mock the OpenSearch bulk response
-            self.opensearch_mock.bulk.return_value = {
-                'errors': False,
-                'items': [{'index': {'status': 200, '_id': '1'}}]
-            }
-            
-            # Process the JSON content
-            row_count = self.processor._process_json_file(json_content, 'test.json')
-            
-            # Verify the row count
-            self.assertEqual(row_count, 1)
-            
-            # Verify that documents were added to the queue
-            mock_queue.put.assert_called_once()
-            batch = mock_queue.put.call_args[0][0]
-            self.assertEqual(len(batch), 1)
-            
-            # Verify document content
-            self.assertEqual(batch[0]['id'], 1)
-            self.assertEqual(batch[0]['name'], 'test1')
+        # Capture the batches added to the queue
+        spy = _QSpy()
+        self.processor._batch_queue = spy
+        
+        # Process the JSON content
+        row_count = self.processor._process_json_file(json_content, 'test.json')
+        
+        # Verify the row count
+        self.assertEqual(row_count, 1)
+        
+        # Verify that the document was added to the queue
+        self.assertEqual(spy.puts, [[{'id': 1, 'name': 'test1'}]])
 
     def test_process_json_file_error_handling(self):
         """Test JSON file processing with invalid data."""
         # Create test JSON content with invalid data
         json_content = '[{"id": 1, "name": "test1"}, {"id": "invalid", "name": 123}, {"id": 3, "name": "test3"}]'
         
-        # Mock the batch queue to verify documents are added
-        with patch.object(self.processor, '_batch_queue') as mock_queue:
-            # Mock the OpenSearch bulk response with some errors
-            self.opensearch_mock.bulk.return_value = {
-                'errors': True,
-                'items': [
-                    {'index': {'status': 200, '_id': '1'}},
-                    {'index': {'status': 400, 'error': {'type': 'mapper_parsing_exception', 'reason': 'Invalid id'}}},
-                    {'index': {'status': 200, '_id': '3'}}
-                ]
-            }
-            
-            # Process the JSON content
-            row_count = self.processor._process_json_file(json_content, 'test.json')
-            
-            # Verify the row count (should still count all rows)
-            self.assertEqual(row_count, 3)
-            
-            # Verify that documents were added to the queue
-            mock_queue.put.assert_called_once()
-            batch = mock_queue.put.call_args[0][0]
-            self.assertEqual(len(batch), 3)
-            
-            # Verify document content (all values should be preserved as is)
-            self.assertEqual(batch[0]['id'], 1)
-            self.assertEqual(batch[0]['name'], 'test1')
-            self.assertEqual(batch[1]['id'], 'invalid')
-            self.assertEqual(batch[1]['name'], 123)
-            self.assertEqual(batch[2]['id'], 3)
-            self.assertEqual(batch[2]['name'], 'test3')
-
-if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+        # Capture the batches added to the queue
+        spy = _QSpy()
+        self.processor._batch_queue = spy
+        
+        # Process the JSON content
+        row_count = self.processor._process_json_file(json_content, 'test.json')
+        
+        # Verify the row count (should still count all rows)
+        self.assertEqual(row_count, 3)
+        
+        # Verify that documents were added to the queue with all values preserved as is
+        self.assertEqual(spy.puts, [[
+            {'id': 1, 'name': 'test1'},
+            {'id': 'invalid', 'name': 123},
+            {'id': 3, 'name': 'test3'}
+        ]])
@@ -8,163 +8,159 @@ This module contains tests for:
 """
 
 import unittest
-from unittest.mock import patch, MagicMock, call
+from unittest.mock import patch, Mock
 import json
 import os
-import sys
-from datetime import datetime
-
-# Add the parent directory to the path so we can import the file_processor module
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from types import MappingProxyType, SimpleNamespace
 from file_processor import FileProcessor
+from tests._fakes import _FakeResponse
+
+# Dummy AWS credentials so boto3 resolves them from the environment instead of
+# falling through to the instance metadata service
+AWS_TEST_CREDENTIALS = {
+    'AWS_ACCESS_KEY_ID': 'EXAMPLE_KEY',
+    'AWS_SECRET_ACCESS_KEY': 'EXAMPLE_SECRET',
+    'AWS_DEFAULT_REGION': 'us-east-1'
+}
+# Snapshot of os.environ taken in setUpModule and restored in tearDownModule
+_environ_patcher = patch.dict('os.environ')
+
+# DLQ the processors under test report to
+TEST_DLQ_ARN = 'arn:aws:sqs:region:account-id:queue-name'
+
+# Minimal environment for the initialization tests, which start from a cleared os.environ
+INIT_ENV = {
+    'OPENSEARCH_ENDPOINT': 'http://localhost:9200',
+    'AWS_REGION': 'us-east-1',
+    'VERIFY_SSL': 'false',
+    **AWS_TEST_CREDENTIALS
+}
+
+# Successful OpenSearch connection check; the manager only calls raise_for_status and json
+OK_RESPONSE = _FakeResponse(payload={'version': {'number': '7.10.2'}})
+
+# Read-only error payload template; tests copy it because _send_error_to_sqs adds a timestamp
+BASE_PAYLOAD = MappingProxyType({
+    'error_message': 'Test error',
+    'failed_records': (),
+    'file_key': 'test.csv',
+    'source': 'test'
+})
+
+# Error raised by the SQS client in the failure-path tests
+SQS_EXCEPTION = Exception('Test exception')
+
+# 100 KB record body shared by the large-message tests
+LARGE_RECORD_DATA = 'x' * 100000
+# Three 100 KB failed records (~300 KB), enough to exceed the 230 KB SQS limit
+LARGE_FAILED_RECORDS = tuple({'data': LARGE_RECORD_DATA} for _ in range(3))
+
+def _make_sqs_only_processor(sqs_client, arn=TEST_DLQ_ARN, enabled=True):
+    """Build a FileProcessor with only the SQS attributes set, skipping __init__."""
+    processor = FileProcessor.__new__(FileProcessor)
+    processor.sqs_client = sqs_client
+    processor.sqs_dlq_arn = arn
+    processor.dlq_enabled = enabled
+    return processor
+
+
+def setUpModule():
+    """Supply the dummy AWS credentials where the environment has none."""
+    _environ_patcher.start()
+    for key, value in AWS_TEST_CREDENTIALS.items():
+        os.environ.setdefault(key, value)
+
+def tearDownModule():
+    """Restore the environment so the credentials do not leak into later modules."""
+    _environ_patcher.stop()
 
 class TestFileProcessorSQS(unittest.TestCase):
     """Test cases for the SQS error reporting functionality in FileProcessor."""
     
-    def setUp(self):
-        """Set up test environment."""
-        # Set environment variables
-        os.environ['OPENSEARCH_ENDPOINT'] = 'http://localhost:9200'
-        os.environ['DLQ'] = 'enabled'
-        os.environ['SQS-DLQ-ARN'] = 'arn:aws:sqs:region:account-id:queue-name'
-        
-        # Create mock for SQS client
-        self.sqs_mock = MagicMock()
-        self.sqs_mock.get_queue_url.return_value = {'QueueUrl': 'https://sqs.queue.url'}
-        self.sqs_mock.send_message.return_value = {'MessageId': 'test-message-id'}
-        
-        # Create mock for boto3 client
-        self.boto3_mock = MagicMock()
-        self.boto3_mock.client.return_value = self.sqs_mock
+    @classmethod
+    def setUpClass(cls):
+        """Patch the AWS and HTTP dependencies once for the whole test class."""
+        cls.boto3_patcher = patch('boto3.client')
+        cls.requests_patcher = patch('requests.get', return_value=OK_RESPONSE)
         
-        # Create mock for OpenSearch connection
-        self.opensearch_mock = MagicMock()
-        self.opensearch_mock.info.return_value = {'version': {'number': '7.10.2'}}
-        self.opensearch_mock.indices.exists.return_value = True
-        self.opensearch_mock.indices.get.return_value = {'test-index': {'mappings': {}}}
-        self.opensearch_mock.indices.stats.return_value = {'indices': {'test-index': {'total': {'docs': {'count': 100}}}}}
-        self.opensearch_mock.count.return_value = {'count': 100}
+        cls.boto3_client_mock = cls.boto3_patcher.start()
+        cls.requests_patcher.start()
         
-        # Create mock for requests
-        self.requests_mock = MagicMock()
-        self.requests_mock.get.return_value = MagicMock(
-            status_code=200,
-            json=lambda: {'version': {'number': '7.10.2'}}
+        # Stub the SQS client; only the two calls the tests track are mocks
+        cls.sqs_mock = SimpleNamespace(
+            get_queue_url=Mock(return_value={'QueueUrl': 'https://sqs.queue.url'}),
+            send_message=Mock(return_value={'MessageId': 'test-message-id'})
         )
-        self.requests_mock.get.return_value.raise_for_status = MagicMock()
-        
-        # Create mock for OpenSearchBaseManager
-        self.manager_mock = MagicMock()
-        self.manager_mock.opensearch = self.opensearch_mock
-        self.manager_mock.opensearch_endpoint = 'http://localhost:9200'
-        self.manager_mock._make_request.return_value = {
-            'status': 'success',
-            'response': MagicMock(
-                status_code=200,
-                json=lambda: {'version': {'number': '7.10.2'}}
-            )
-        }
-        
-        # Apply patches
-        self.boto3_patcher = patch('boto3.client', return_value=self.sqs_mock)
-        self.opensearch_patcher = patch('opensearchpy.OpenSearch', return_value=self.opensearch_mock)
-        self.requests_patcher = patch('requests.get', return_value=self.requests_mock.get.return_value)
-        self.manager_patcher = patch('opensearch_base_manager.OpenSearchBaseManager', return_value=self.manager_mock)
-        
-        self.boto3_patcher.start()
-        self.opensearch_patcher.start()
-        self.requests_patcher.start()
-        self.manager_patcher.start()
-        
-        # Initialize file processor
-        self.file_processor = FileProcessor()
-        self.file_processor._make_request = self.manager_mock._make_request
     
-    def tearDown(self):
-        """Clean up after tests."""
-        self.boto3_patcher.stop()
-        self.opensearch_patcher.stop()
-        self.requests_patcher.stop()
-        self.manager_patcher.stop()
-        
-        # Clean up environment variables
-        if 'DLQ' in os.environ:
-            del os.environ['DLQ']
-        if 'SQS-DLQ-ARN' in os.environ:
-            del os.environ['SQS-DLQ-ARN']
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the class-level patches."""
+        cls.boto3_patcher.stop()
+        cls.requests_patcher.stop()
+    
+    def setUp(self):
+        """Reset the shared SQS client stub and build an SQS-only processor around it."""
+        # Clear recorded calls and any side effect a previous test installed
+        self.sqs_mock.get_queue_url.reset_mock(side_effect=True)
+        self.sqs_mock.send_message.reset_mock(side_effect=True)
+        self.file_processor = _make_sqs_only_processor(self.sqs_mock)
+    
+    def _init_processor(self, **env):
+        """Build a FileProcessor against a clean environment plus the given variables."""
+        with patch.dict('os.environ', {**INIT_ENV, **env}, clear=True):
+            return FileProcessor()
     
     def test_init_with_sqs_arn(self):
         """Test initialization with SQS ARN."""
-        self.assertIsNotNone(self.file_processor.sqs_client)
-        self.assertEqual(self.file_processor.sqs_dlq_arn, 'arn:aws:sqs:region:account-id:queue-name')
-        self.assertTrue(self.file_processor.dlq_enabled)
+        processor = self._init_processor(DLQ='enabled', **{'SQS-DLQ-ARN': TEST_DLQ_ARN})
+        self.assertIsNotNone(processor.sqs_client)
+        self.boto3_client_mock.assert_any_call('sqs')
+        self.assertEqual(processor.sqs_dlq_arn, TEST_DLQ_ARN)
+        self.assertTrue(processor.dlq_enabled)
     
     def test_init_without_sqs_arn(self):
         """Test initialization without SQS ARN."""
-        # Create mock credentials
-        mock_credentials = MagicMock()
-        mock_credentials.access_key = 'test-access-key'
-        mock_credentials.secret_key = 'test-secret-key'
-        mock_credentials.token = 'test-token'
-        
-        # Create mock session
-        mock_session = MagicMock()
-        mock_session.get_credentials.return_value = mock_credentials
-        
-        with patch.dict('os.environ', {
-            'OPENSEARCH_ENDPOINT': 'http://localhost:9200',
-            'DLQ': 'enabled',
-            'AWS_REGION': 'us-east-1',
-            'VERIFY_SSL': 'false'
-        }, clear=True), \
-             patch('boto3.Session', return_value=mock_session):
-            processor = FileProcessor()
-            self.assertIsNone(processor.sqs_dlq_arn)
-            self.assertFalse(processor.dlq_enabled)
+        processor = self._init_processor(DLQ='enabled')
+        self.assertIsNone(processor.sqs_dlq_arn)
+        self.assertFalse(processor.dlq_enabled)
     
     def test_init_with_dlq_disabled(self):
         """Test initialization with DLQ disabled."""
-        # Create mock credentials
-        mock_credentials = MagicMock()
-        mock_credentials.access_key = 'test-access-key'
-        mock_credentials.secret_key = 'test-secret-key'
-        mock_credentials.token = 'test-token'
-        
-        # Create mock session
-        mock_session = MagicMock()
-        mock_session.get_credentials.return_value = mock_credentials
-        
-        with patch.dict('os.environ', {
-            'OPENSEARCH_ENDPOINT': 'http://localhost:9200',
-            'SQS-DLQ-ARN': 'arn:aws:sqs:region:account-id:queue-name',
-            'DLQ': 'disabled',
-            'AWS_REGION': 'us-east-1',
-            'VERIFY_SSL': 'false'
-        }, clear=True), \
-             patch('boto3.Session', return_value=mock_session):
-            processor = FileProcessor()
-            self.assertIsNone(processor.sqs_client)
-            self.assertFalse(processor.dlq_enabled)
+        processor = self._init_processor(**{
+            'SQS-DLQ-ARN': TEST_DLQ_ARN,
+            'DLQ': 'disabled'
+        })
+        self.assertIsNone(processor.sqs_client)
+        self.assertFalse(processor.dlq_enabled)
     
     def test_send_error_to_sqs_success(self):
         """Test successful error message sending to SQS."""
-        error_payload = {
-            'error_message': 'Test error',
-            'failed_records': [],
-            'file_key': 'test.csv',
-            'source': 'test'
-        }
-        result = self.file_processor._send_error_to_sqs(error_payload)
+        error_payload = {**BASE_PAYLOAD}
+        
+        # Capture the payload at the serialization boundary instead of parsing the message body
+        dumps = json.dumps
+        serialized = []
+        def dumps_spy(obj, *args, **kwargs):
+            serialized.append(obj)
+            return dumps(obj, *args, **kwargs)
+        
+        with patch('file_processor.json.dumps', side_effect=dumps_spy):
+            result = self.file_processor._send_error_to_sqs(error_payload)
+        
         self.assertTrue(result)
-        self.sqs_mock.send_message.assert_called_once()
+        self.assertEqual(len(serialized), 1)
+        self.assertIs(serialized[0], error_payload)
+        self.assertEqual(serialized[0]['error_message'], 'Test error')
+        self.assertIn('timestamp', serialized[0])
+        self.sqs_mock.send_message.assert_called_once_with(
+            QueueUrl='https://sqs.queue.url',
+            MessageBody=dumps(error_payload)
+        )
     
     def test_send_error_to_sqs_without_arn(self):
         """Test sending error message to SQS when ARN is not configured."""
         self.file_processor.sqs_dlq_arn = None
-        error_payload = {
-            'error_message': 'Test error',
-            'failed_records': []
-        }
+        error_payload = {**BASE_PAYLOAD}
         result = self.file_processor._send_error_to_sqs(error_payload)
         self.assertFalse(result)
         self.sqs_mock.send_message.assert_not_called()
@@ -172,36 +168,44 @@ class TestFileProcessorSQS(unittest.TestCase):
     def test_send_error_to_sqs_invalid_arn(self):
         """Test sending error message to SQS with invalid ARN."""
         self.file_processor.sqs_dlq_arn = 'invalid:arn'
-        error_payload = {
-            'error_message': 'Test error',
-            'failed_records': []
-        }
+        error_payload = {**BASE_PAYLOAD}
         result = self.file_processor._send_error_to_sqs(error_payload)
         self.assertFalse(result)
         self.sqs_mock.send_message.assert_not_called()
     
     def test_send_error_to_sqs_exception(self):
         """Test sending error message to SQS when an exception occurs."""
-        self.sqs_mock.get_queue_url.side_effect = Exception('Test exception')
-        error_payload = {
-            'error_message': 'Test error',
-            'failed_records': []
-        }
-        result = self.file_processor._send_error_to_sqs(error_payload)
+        self.sqs_mock.get_queue_url.side_effect = SQS_EXCEPTION
+        error_payload = {**BASE_PAYLOAD}
+        with self.assertLogs('file_processor', level='ERROR') as logs:
+            result = self.file_processor._send_error_to_sqs(error_payload)
         self.assertFalse(result)
+        self.assertIn(f"Failed to get queue URL: {SQS_EXCEPTION}", logs.output[0])
+        self.sqs_mock.send_message.assert_not_called()
     
     def test_send_error_to_sqs_large_message(self):
         """Test sending large error message to SQS."""
-        error_payload = {
-            'error_message': 'Test error',
-            'failed_records': [{'data': 'x' * 100000}],  # Large record
-            'file_key': 'test.csv',
-            'source': 'test'
-        }
+        error_payload = {**BASE_PAYLOAD, 'failed_records': [{'data': LARGE_RECORD_DATA}]}  # Large record
         result = self.file_processor._send_error_to_sqs(error_payload)
         self.assertTrue(result)
         self.sqs_mock.send_message.assert_called()
     
+    def test_send_error_to_sqs_large_real_payload(self):
+        """Test that a payload over the 230 KB limit is split into multiple SQS messages."""
+        error_payload = {**BASE_PAYLOAD, 'failed_records': list(LARGE_FAILED_RECORDS)}
+        result = self.file_processor._send_error_to_sqs(error_payload)
+        self.assertTrue(result)
+        
+        # Two records fit in each part, so three records need two messages
+        self.assertEqual(self.sqs_mock.send_message.call_count, 2)
+        for part, sent in enumerate(self.sqs_mock.send_message.call_args_list, start=1):
+            with self.subTest(part=part):
+                body = sent.kwargs['MessageBody']
+                self.assertLessEqual(len(body.encode('utf-8')), 235520)
+                message = json.loads(body)
+                self.assertEqual(message['message_part'], part)
+                self.assertEqual(message['total_parts'], 2)
+    
     def test_print_error_records(self):
         """Test the _print_error_records method."""
         failed_records = [
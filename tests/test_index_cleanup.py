@@ -6,324 +6,193 @@ index validation, recreation, and error handling.
 """
 
 import unittest
-from unittest.mock import patch, MagicMock
-import json
+import copy
+from unittest.mock import patch, Mock, call
 import logging
 from index_cleanup import OpenSearchIndexManager, main
+from tests._fakes import _FakeResponse
+
+# Expected validate_and_cleanup_index results; the document results double as the stubbed step returns
+CLEANUP_SUCCESS = {
+    'status': 'success',
+    'message': 'Successfully cleaned up index test-index',
+    'documents_deleted': 100
+}
+DELETE_DOCUMENTS_ERROR = {'status': 'error', 'message': 'Failed to delete documents'}
+ALIASED_INDEX_ERROR = {
+    'status': 'error',
+    'message': 'Index test-index is part of alias(es): test-alias. Cannot remove data from an aliased index.',
+    'aliases': ['test-alias']
+}
+
+# Cleanup step return values shared by the scenarios that reach document deletion
+CLEANUP_STEPS_TO_DELETE = {'_verify_index_exists': True, '_check_index_aliases': {}, '_get_index_count': 100}
+
+# (scenario, index name, cleanup step return values in call order, expected result)
+VALIDATE_SCENARIOS = (
+    ('success', 'test-index', {**CLEANUP_STEPS_TO_DELETE, '_delete_all_documents': CLEANUP_SUCCESS}, CLEANUP_SUCCESS),
+    ('not_exists', 'non-existent-index', {'_verify_index_exists': False},
+     {'status': 'success', 'message': 'Index non-existent-index does not exist'}),
+    ('with_aliases', 'test-index', {'_verify_index_exists': True, '_check_index_aliases': {'test-alias': {}}},
+     ALIASED_INDEX_ERROR),
+    ('delete_error', 'test-index', {**CLEANUP_STEPS_TO_DELETE, '_delete_all_documents': DELETE_DOCUMENTS_ERROR},
+     DELETE_DOCUMENTS_ERROR),
+)
+
+# Error raised by a cleanup step in the exception test
+TEST_EXCEPTION = Exception("Test exception")
+
+# Settings and mappings of the index the _recreate_index tests rebuild
+INDEX_SETTINGS = {'index': {'number_of_shards': '1'}}
+INDEX_MAPPINGS = {'properties': {'field1': {'type': 'keyword'}}}
+
+# Shared _make_request results for the _recreate_index tests, built once at import
+SETTINGS_RESPONSE = {
+    'status': 'success',
+    'response': _FakeResponse(payload={'test-index': {'settings': INDEX_SETTINGS}})
+}
+MAPPINGS_RESPONSE = {
+    'status': 'success',
+    'response': _FakeResponse(payload={'test-index': {'mappings': INDEX_MAPPINGS}})
+}
+DELETE_OK = {'status': 'success', 'message': 'Index deleted successfully'}
+CREATE_OK = {'status': 'success', 'message': 'Index created successfully'}
+NOT_FOUND_MESSAGE = 'Failed to make request to OpenSearch: 404 Client Error: Not Found for url: https://search-mynewdomain-ovgab6nu4xfggw52b77plmruhm.us-east-1.es.amazonaws.com/non-existent-index/_settings'
+
+# Settings and mappings lookups shared by every scenario that gets past the first request
+RECREATE_PREFIX = (SETTINGS_RESPONSE, MAPPINGS_RESPONSE)
+
+# Requests a full recreation of test-index makes, in order
+RECREATE_CALLS = [
+    call('GET', '/test-index/_settings'),
+    call('GET', '/test-index/_mappings'),
+    call('DELETE', '/test-index'),
+    call('PUT', '/test-index', data={'settings': INDEX_SETTINGS, 'mappings': INDEX_MAPPINGS})
+]
+
+# (scenario, index name, _make_request results, expected result, expected requests)
+RECREATE_SCENARIOS = (
+    ('success', 'test-index', RECREATE_PREFIX + (DELETE_OK, CREATE_OK),
+     {'status': 'success', 'message': 'Successfully recreated index test-index'}, RECREATE_CALLS),
+    ('not_exists', 'non-existent-index', ({'status': 'error', 'message': NOT_FOUND_MESSAGE},),
+     {'status': 'error', 'message': f'Failed to get index settings: {NOT_FOUND_MESSAGE}'}, [call('GET', '/non-existent-index/_settings')]),
+    ('delete_error', 'test-index', RECREATE_PREFIX + ({'status': 'error', 'message': 'Failed to delete index'},),
+     {'status': 'error', 'message': 'Failed to drop index: Failed to delete index'}, RECREATE_CALLS[:3]),
+    ('create_error', 'test-index', RECREATE_PREFIX + (DELETE_OK, {'status': 'error', 'message': 'Failed to create index'}),
+     {'status': 'error', 'message': 'Failed to create index: Failed to create index'}, RECREATE_CALLS),
+)
+
+# (scenario, validate_and_cleanup_index result, OpenSearchIndexManager construction error, expected exit code)
+MAIN_SCENARIOS = (
+    ('success', {'status': 'success', 'message': 'Successfully cleaned up index test-index'}, None, 0),
+    ('error', {'status': 'error', 'message': 'Failed to clean up index: Index is part of an alias'}, None, 0),
+    ('exception', None, ValueError("Configuration error"), 1),
+)
+
+def setUpModule():
+    """Disable logging once for every test in this module."""
+    logging.disable(logging.CRITICAL)
+
+def tearDownModule():
+    """Re-enable logging after the last test in this module."""
+    logging.disable(logging.NOTSET)
 
 class TestOpenSearchIndexManager(unittest.TestCase):
     """Test cases for the OpenSearchIndexManager class."""
     
-    def setUp(self):
-        """Set up test environment."""
-        # Create mock for OpenSearch connection
-        self.opensearch_mock = MagicMock()
-        self.opensearch_mock.info.return_value = {'version': {'number': '7.10.2'}}
-        self.opensearch_mock.indices.exists.return_value = True
-        self.opensearch_mock.indices.get.return_value = {'test-index': {'mappings': {}}}
-        self.opensearch_mock.indices.stats.return_value = {'indices': {'test-index': {'total': {'docs': {'count': 0}}}}}
-        self.opensearch_mock.indices.delete.return_value = {'acknowledged': True}
-        self.opensearch_mock.indices.create.return_value = {'acknowledged': True}
-        self.opensearch_mock.indices.put_mapping.return_value = {'acknowledged': True}
-        self.opensearch_mock.indices.put_settings.return_value = {'acknowledged': True}
-        
-        # Create mock for requests
-        self.requests_mock = MagicMock()
-        self.requests_mock.get.return_value = MagicMock(
-            status_code=200,
-            json=lambda: {'version': {'number': '7.10.2'}}
-        )
-        self.requests_mock.get.return_value.raise_for_status = MagicMock()
-        
-        # Create mock for OpenSearchBaseManager
-        self.manager_mock = MagicMock()
-        self.manager_mock.opensearch = self.opensearch_mock
-        self.manager_mock.opensearch_endpoint = 'https://dummy-opensearch-endpoint'
+    @classmethod
+    def setUpClass(cls):
+        """Patch the OpenSearch connection check and build the index manager once for the whole test class."""
+        # Stub the connection test response
+        cls.connection_response = _FakeResponse(payload={'version': {'number': '7.10.2'}})
         
         # Apply patches
-        self.opensearch_patcher = patch('opensearchpy.OpenSearch', return_value=self.opensearch_mock)
-        self.requests_patcher = patch('requests.get', return_value=self.requests_mock.get.return_value)
-        self.manager_patcher = patch('opensearch_base_manager.OpenSearchBaseManager', return_value=self.manager_mock)
-        
-        self.opensearch_patcher.start()
-        self.requests_patcher.start()
-        self.manager_patcher.start()
+        cls.requests_patcher = patch('requests.get', return_value=cls.connection_response)
+        cls.requests_patcher.start()
+        cls.addClassCleanup(cls.requests_patcher.stop)
         
-        # Initialize the index manager
-        self.index_manager = OpenSearchIndexManager()
-        self.index_manager.opensearch_manager = self.manager_mock
+        # Initialize the prototype index manager; each test works on a shallow copy
+        cls.prototype = OpenSearchIndexManager()
     
-    def tearDown(self):
-        """Clean up after tests."""
-        self.opensearch_patcher.stop()
-        self.requests_patcher.stop()
-        self.manager_patcher.stop()
+    def setUp(self):
+        """Copy the prototype so methods a test replaces do not leak into other tests."""
+        self.index_manager = copy.copy(self.prototype)
+    
+    def _mock_cleanup_steps(self, **return_values):
+        """Replace cleanup steps with children of one parent Mock so their call order is recorded."""
+        steps = Mock(spec_set=list(return_values))
+        for name, value in return_values.items():
+            step = getattr(steps, name)
+            step.return_value = value
+            setattr(self.index_manager, name, step)
+        return steps
     
     def test_init(self):
         """Test initialization of the OpenSearchIndexManager class."""
         self.assertIsNotNone(self.index_manager)
     
-    def test_validate_and_cleanup_index_success(self):
-        """Test successful index validation and cleanup."""
-        # Mock the necessary methods
-        self.index_manager._verify_index_exists = MagicMock(return_value=True)
-        self.index_manager._get_index_count = MagicMock(return_value=100)
-        self.index_manager._check_index_aliases = MagicMock(return_value={})
-        self.index_manager._delete_all_documents = MagicMock(return_value={
-            'status': 'success',
-            'message': 'Successfully cleaned up index test-index',
-            'documents_deleted': 100
-        })
-        
-        # Perform validation and cleanup
-        result = self.index_manager.validate_and_cleanup_index('test-index')
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'success')
-        self.assertEqual(result['message'], 'Successfully cleaned up index test-index')
-        self.assertEqual(result['documents_deleted'], 100)
-        
-        # Verify method calls
-        self.index_manager._verify_index_exists.assert_called_once_with('test-index')
-        self.index_manager._check_index_aliases.assert_called_once_with('test-index')
-        self.index_manager._get_index_count.assert_called_once_with('test-index')
-        self.index_manager._delete_all_documents.assert_called_once_with('test-index')
-    
-    def test_validate_and_cleanup_index_not_exists(self):
-        """Test validation and cleanup when index does not exist."""
-        # Mock the necessary methods
-        self.index_manager._verify_index_exists = MagicMock(return_value=False)
-        
-        # Perform validation and cleanup
-        result = self.index_manager.validate_and_cleanup_index('non-existent-index')
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'success')
-        self.assertEqual(result['message'], 'Index non-existent-index does not exist')
-        
-        # Verify method calls
-        self.index_manager._verify_index_exists.assert_called_once_with('non-existent-index')
-    
-    def test_validate_and_cleanup_index_with_aliases(self):
-        """Test validation and cleanup when index has aliases."""
-        # Mock the necessary methods
-        self.index_manager._verify_index_exists = MagicMock(return_value=True)
-        self.index_manager._check_index_aliases = MagicMock(return_value={'test-alias': {}})
-        
-        # Perform validation and cleanup
-        result = self.index_manager.validate_and_cleanup_index('test-index')
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'error')
-        self.assertEqual(result['message'], 'Index test-index is part of alias(es): test-alias. Cannot remove data from an aliased index.')
-        self.assertEqual(result['aliases'], ['test-alias'])
-        
-        # Verify method calls
-        self.index_manager._verify_index_exists.assert_called_once_with('test-index')
-        self.index_manager._check_index_aliases.assert_called_once_with('test-index')
-    
-    def test_validate_and_cleanup_index_delete_error(self):
-        """Test validation and cleanup when document deletion fails."""
-        # Mock the necessary methods
-        self.index_manager._verify_index_exists = MagicMock(return_value=True)
-        self.index_manager._get_index_count = MagicMock(return_value=100)
-        self.index_manager._check_index_aliases = MagicMock(return_value={})
-        self.index_manager._delete_all_documents = MagicMock(return_value={
-            'status': 'error',
-            'message': 'Failed to delete documents'
-        })
-        
-        # Perform validation and cleanup
-        result = self.index_manager.validate_and_cleanup_index('test-index')
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'error')
-        self.assertEqual(result['message'], 'Failed to delete documents')
-        
-        # Verify method calls
-        self.index_manager._verify_index_exists.assert_called_once_with('test-index')
-        self.index_manager._check_index_aliases.assert_called_once_with('test-index')
-        self.index_manager._get_index_count.assert_called_once_with('test-index')
-        self.index_manager._delete_all_documents.assert_called_once_with('test-index')
+    def test_validate_and_cleanup_index(self):
+        """Test index validation and cleanup on success and at each step that stops it."""
+        for scenario, index_name, step_returns, expected_result in VALIDATE_SCENARIOS:
+            with self.subTest(scenario=scenario):
+                # Fresh copy so stubs from the previous scenario do not carry over
+                self.index_manager = copy.copy(self.prototype)
+                
+                # Mock the necessary methods
+                steps = self._mock_cleanup_steps(**step_returns)
+                
+                # Perform validation and cleanup
+                result = self.index_manager.validate_and_cleanup_index(index_name)
+                
+                # Verify the result
+                self.assertEqual(result, expected_result)
+                
+                # Verify method calls, in order
+                self.assertEqual(steps.mock_calls, [getattr(call, name)(index_name) for name in step_returns])
     
     def test_validate_and_cleanup_index_exception(self):
         """Test exception handling in the validate_and_cleanup_index method."""
         # Mock the necessary methods to raise an exception
-        self.index_manager._verify_index_exists = MagicMock(side_effect=Exception("Test exception"))
+        self.index_manager._verify_index_exists = Mock(side_effect=TEST_EXCEPTION)
         
         # Perform validation and cleanup
         result = self.index_manager.validate_and_cleanup_index('test-index')
         
         # Verify the result
-        self.assertEqual(result['status'], 'error')
-        self.assertEqual(result['message'], 'Error during index validation and cleanup: Test exception')
+        self.assertEqual(result, {'status': 'error', 'message': 'Error during index validation and cleanup: Test exception'})
         
         # Verify method calls
         self.index_manager._verify_index_exists.assert_called_once_with('test-index')
     
-    def test_recreate_index_success(self):
-        """Test successful index recreation."""
-        # Mock the necessary methods
-        self.index_manager._verify_index_exists = MagicMock(return_value=True)
-        self.index_manager._get_index_settings = MagicMock(return_value={
-            'status': 'success',
-            'response': {'test-index': {'settings': {'index': {'number_of_shards': '1'}}}}
-        })
-        self.index_manager._get_index_mappings = MagicMock(return_value={
-            'properties': {'field1': {'type': 'keyword'}}
-        })
-        
-        # Mock _make_request with simpler responses
-        self.index_manager._make_request = MagicMock(side_effect=[
-            {'status': 'success', 'response': MagicMock(status_code=200, json=lambda: {'test-index': {'settings': {'index': {'number_of_shards': '1'}}}})},
-            {'status': 'success', 'response': MagicMock(status_code=200, json=lambda: {'test-index': {'mappings': {'properties': {'field1': {'type': 'keyword'}}}}})},
-            {'status': 'success', 'message': 'Index deleted successfully'},
-            {'status': 'success', 'message': 'Index created successfully'}
-        ])
-        
-        # Perform index recreation
-        result = self.index_manager._recreate_index('test-index')
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'success')
-        self.assertEqual(result['message'], 'Successfully recreated index test-index')
-        
-        # Verify method calls
-        self.assertEqual(self.index_manager._make_request.call_count, 4)
-    
-    def test_recreate_index_not_exists(self):
-        """Test index recreation when index does not exist."""
-        # Mock the necessary methods
-        self.index_manager._verify_index_exists = MagicMock(return_value=True)
-        self.index_manager._make_request = MagicMock(return_value={
-            'status': 'error',
-            'message': 'Failed to make request to OpenSearch: 404 Client Error: Not Found for url: https://search-mynewdomain-ovgab6nu4xfggw52b77plmruhm.us-east-1.es.amazonaws.com/non-existent-index/_settings'
-        })
-        
-        # Perform index recreation
-        result = self.index_manager._recreate_index('non-existent-index')
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'error')
-        self.assertEqual(result['message'], 'Failed to get index settings: Failed to make request to OpenSearch: 404 Client Error: Not Found for url: https://search-mynewdomain-ovgab6nu4xfggw52b77plmruhm.us-east-1.es.amazonaws.com/non-existent-index/_settings')
-        
-        # Verify method calls
-        self.index_manager._make_request.assert_called_once_with('GET', '/non-existent-index/_settings')
-    
-    def test_recreate_index_delete_error(self):
-        """Test index recreation when index deletion fails."""
-        # Mock the necessary methods
-        self.index_manager._verify_index_exists = MagicMock(return_value=True)
-        self.index_manager._get_index_settings = MagicMock(return_value={
-            'status': 'success',
-            'response': {'test-index': {'settings': {'index': {'number_of_shards': '1'}}}}
-        })
-        self.index_manager._get_index_mappings = MagicMock(return_value={
-            'properties': {'field1': {'type': 'keyword'}}
-        })
-        
-        # Mock _make_request with simpler responses
-        self.index_manager._make_request = MagicMock(side_effect=[
-            {'status': 'success', 'response': MagicMock(status_code=200, json=lambda: {'test-index': {'settings': {'index': {'number_of_shards': '1'}}}})},
-            {'status': 'success', 'response': MagicMock(status_code=200, json=lambda: {'test-index': {'mappings': {'properties': {'field1': {'type': 'keyword'}}}}})},
-            {'status': 'error', 'message': 'Failed to delete index'}
-        ])
-        
-        # Perform index recreation
-        result = self.index_manager._recreate_index('test-index')
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'error')
-        self.assertEqual(result['message'], 'Failed to drop index: Failed to delete index')
-        
-        # Verify method calls
-        self.assertEqual(self.index_manager._make_request.call_count, 3)
-    
-    def test_recreate_index_create_error(self):
-        """Test index recreation when index creation fails."""
-        # Mock the necessary methods
-        self.index_manager._verify_index_exists = MagicMock(return_value=True)
-        self.index_manager._get_index_settings = MagicMock(return_value={
-            'status': 'success',
-            'response': {'test-index': {'settings': {'index': {'number_of_shards': '1'}}}}
-        })
-        self.index_manager._get_index_mappings = MagicMock(return_value={
-            'properties': {'field1': {'type': 'keyword'}}
-        })
-        
-        # Mock _make_request with simpler responses
-        self.index_manager._make_request = MagicMock(side_effect=[
-            {'status': 'success', 'response': MagicMock(status_code=200, json=lambda: {'test-index': {'settings': {'index': {'number_of_shards': '1'}}}})},
-            {'status': 'success', 'response': MagicMock(status_code=200, json=lambda: {'test-index': {'mappings': {'properties': {'field1': {'type': 'keyword'}}}}})},
-            {'status': 'success', 'message': 'Index deleted successfully'},
-            {'status': 'error', 'message': 'Failed to create index'}
-        ])
-        
-        # Perform index recreation
-        result = self.index_manager._recreate_index('test-index')
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'error')
-        self.assertEqual(result['message'], 'Failed to create index: Failed to create index')
-        
-        # Verify method calls
-        self.assertEqual(self.index_manager._make_request.call_count, 4)
+    def test_recreate_index(self):
+        """Test index recreation on success and on each failing request."""
+        for scenario, index_name, responses, expected_result, expected_calls in RECREATE_SCENARIOS:
+            with self.subTest(scenario=scenario):
+                self.index_manager._make_request = Mock(side_effect=responses)
+                
+                # Perform index recreation
+                result = self.index_manager._recreate_index(index_name)
+                
+                # Verify the result
+                self.assertEqual(result, expected_result)
+                
+                # Verify the requests made, in order
+                self.assertEqual(self.index_manager._make_request.call_args_list, expected_calls)
 
 class TestIndexCleanupMain(unittest.TestCase):
     """Test cases for the main() function in index_cleanup.py."""
     
-    def setUp(self):
-        """Set up test environment."""
-        # Disable logging during tests
-        logging.disable(logging.CRITICAL)
-    
-    def tearDown(self):
-        """Clean up after tests."""
-        # Re-enable logging
-        logging.disable(logging.NOTSET)
-    
-    @patch('argparse.ArgumentParser.parse_args')
-    @patch('index_cleanup.OpenSearchIndexManager')
-    def test_main_success(self, mock_index_manager_class, mock_parse_args):
-        """Test the main function with successful index cleanup."""
-        mock_args = MagicMock(index='test-index')
-        mock_parse_args.return_value = mock_args
-        
-        mock_index_manager = MagicMock()
-        mock_index_manager_class.return_value = mock_index_manager
-        mock_index_manager.validate_and_cleanup_index.return_value = {
-            'status': 'success',
-            'message': 'Successfully cleaned up index test-index'
-        }
-        
-        self.assertEqual(main(), 0)
-        mock_index_manager.validate_and_cleanup_index.assert_called_once_with('test-index')
-    
-    @patch('argparse.ArgumentParser.parse_args')
-    @patch('index_cleanup.OpenSearchIndexManager')
-    def test_main_error(self, mock_index_manager_class, mock_parse_args):
-        """Test the main function with error in index cleanup."""
-        mock_args = MagicMock(index='test-index')
-        mock_parse_args.return_value = mock_args
-        
-        mock_index_manager = MagicMock()
-        mock_index_manager_class.return_value = mock_index_manager
-        mock_index_manager.validate_and_cleanup_index.return_value = {
-            'status': 'error',
-            'message': 'Failed to clean up index: Index is part of an alias'
-        }
-        
-        self.assertEqual(main(), 0)
-        mock_index_manager.validate_and_cleanup_index.assert_called_once_with('test-index')
-    
-    @patch('argparse.ArgumentParser.parse_args')
-    def test_main_exception(self, mock_parse_args):
-        """Test the main function with exception."""
-        mock_args = MagicMock(index='test-index')
-        mock_parse_args.return_value = mock_args
-        
-        with patch('index_cleanup.OpenSearchIndexManager', side_effect=ValueError("Configuration error")):
-            self.assertEqual(main(), 1)
-
-if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+    @patch('argparse.ArgumentParser.parse_args', new_callable=Mock,
+           return_value=Mock(spec_set=['index'], index='test-index'))
+    @patch('index_cleanup.OpenSearchIndexManager', new_callable=Mock)
+    def test_main(self, mock_index_manager_class, mock_parse_args):
+        """Test the main function's exit code for each cleanup outcome."""
+        for scenario, cleanup_result, init_error, expected_exit_code in MAIN_SCENARIOS:
+            with self.subTest(scenario=scenario):
+                mock_index_manager = Mock(spec_set=OpenSearchIndexManager)
+                mock_index_manager.validate_and_cleanup_index.return_value = cleanup_result
+                mock_index_manager_class.configure_mock(return_value=mock_index_manager, side_effect=init_error)
+                
+                self.assertEqual(main(), expected_exit_code)
+                if init_error is None:
+                    mock_index_manager.validate_and_cleanup_index.assert_called_once_with('test-index')
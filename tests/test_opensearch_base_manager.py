@@ -6,53 +6,187 @@ authentication, request handling, and error handling.
 """
 
 import unittest
-from unittest.mock import patch, MagicMock, ANY, call
-import requests
-import json
+import copy
 import os
-import time
+from unittest.mock import patch, Mock, MagicMock, ANY, call
+import requests
+from types import SimpleNamespace
 from opensearch_base_manager import OpenSearchBaseManager, OpenSearchException
+from tests._fakes import _FakeResponse
+
+def _success_results(*responses):
+    """Yield a successful _make_request result for each response, one per call."""
+    for response in responses:
+        yield {'status': 'success', 'response': response}
+
+# Bodiless 200 response shared by tests that only pass it through
+OK_RESPONSE = _FakeResponse()
+
+# Environment the manager under test is constructed with
+TEST_ENV = {
+    'OPENSEARCH_ENDPOINT': 'test-endpoint.com',
+    'AWS_REGION': 'us-east-1',
+    'VERIFY_SSL': 'false'
+}
+
+# Error body OpenSearch returns for a missing index
+INDEX_NOT_FOUND_ERROR = {'error': {'type': 'index_not_found_exception'}}
+
+# Errors raised by the patched request and connection calls
+TEST_EXCEPTION = Exception("Test exception")
+CONNECTION_ERROR = requests.exceptions.ConnectionError("Connection error")
+
+# Getter payloads and the values the manager extracts from them
+SETTINGS_PAYLOAD = {
+    'test-index': {
+        'settings': {
+            'index': {
+                'number_of_shards': '1',
+                'number_of_replicas': '1'
+            }
+        }
+    }
+}
+INDEX_MAPPINGS = {
+    'properties': {
+        'field1': {'type': 'keyword'},
+        'field2': {'type': 'text'}
+    }
+}
+MAPPINGS_PAYLOAD = {'test-index': {'mappings': INDEX_MAPPINGS}}
+ALIASES_PAYLOAD = {'test-index': {'aliases': {'alias1': {}, 'alias2': {}}}}
+
+# Pre-built responses for the count, cat-aliases and delete-by-query requests
+COUNT_RESPONSE = _FakeResponse(payload={'count': 100})
+CAT_ALIASES_RESPONSE = _FakeResponse(payload=[
+    {'alias': 'alias1', 'index': 'test-index'},
+    {'alias': 'alias2', 'index': 'test-index'}
+])
+NO_ALIASES_RESPONSE = _FakeResponse(payload=[])
+DELETE_BY_QUERY_RESPONSE = _FakeResponse(payload={'deleted': 100})
+
+# _make_request results shared by the getter and delete scenarios
+SERVER_ERROR_RESULT = {'status': 'error', 'response': _FakeResponse(status_code=500, text='Internal server error')}
+INDEX_NOT_FOUND_RESULT = {'status': 'error', 'response': _FakeResponse(status_code=404, payload=INDEX_NOT_FOUND_ERROR)}
+
+# (scenario, getter, index name, _make_request config, expected result, expected GET path)
+GET_INDEX_SCENARIOS = (
+    ('settings_success', 'get_index_settings', 'test-index',
+     {'return_value': {'status': 'success', 'response': _FakeResponse(payload=SETTINGS_PAYLOAD)}},
+     {'status': 'success', 'message': 'Index settings retrieved successfully', 'response': SETTINGS_PAYLOAD},
+     '/test-index/_settings'),
+    ('settings_not_found', 'get_index_settings', 'non-existent-index',
+     {'return_value': {'status': 'success', 'response': _FakeResponse(status_code=404, payload=INDEX_NOT_FOUND_ERROR)}},
+     {'status': 'error', 'message': 'Index does not exist', 'response': INDEX_NOT_FOUND_ERROR},
+     '/non-existent-index/_settings'),
+    ('settings_error', 'get_index_settings', 'test-index', {'return_value': SERVER_ERROR_RESULT},
+     {'status': 'error', 'message': 'Failed to get index settings: Internal server error'},
+     '/test-index/_settings'),
+    ('settings_exception', 'get_index_settings', 'test-index', {'side_effect': TEST_EXCEPTION},
+     {'status': 'error', 'message': 'Error getting index settings: Test exception'},
+     '/test-index/_settings'),
+    ('mappings_success', '_get_index_mappings', 'test-index',
+     {'return_value': {'status': 'success', 'response': _FakeResponse(payload=MAPPINGS_PAYLOAD)}},
+     INDEX_MAPPINGS, '/test-index/_mapping'),
+    ('mappings_not_exists', '_get_index_mappings', 'non-existent-index', {'return_value': INDEX_NOT_FOUND_RESULT},
+     {}, '/non-existent-index/_mapping'),
+    ('mappings_error', '_get_index_mappings', 'test-index', {'return_value': SERVER_ERROR_RESULT},
+     {}, '/test-index/_mapping'),
+    ('aliases_success', '_get_index_aliases', 'test-index',
+     {'return_value': {'status': 'success', 'response': _FakeResponse(payload=ALIASES_PAYLOAD)}},
+     ['alias1', 'alias2'], '/test-index/_alias'),
+    ('aliases_not_exists', '_get_index_aliases', 'non-existent-index', {'return_value': INDEX_NOT_FOUND_RESULT},
+     [], '/non-existent-index/_alias'),
+    ('aliases_error', '_get_index_aliases', 'test-index', {'return_value': SERVER_ERROR_RESULT},
+     [], '/test-index/_alias'),
+)
+
+# (scenario, index name, index exists, _make_request config, expected result)
+DELETE_INDEX_SCENARIOS = (
+    ('success', 'test-index', True,
+     {'return_value': {'status': 'success', 'response': _FakeResponse(text='{"acknowledged": true}')}},
+     {'status': 'success', 'message': 'Successfully deleted index test-index'}),
+    ('not_exists', 'non-existent-index', False, {},
+     {'status': 'warning', 'message': 'Index non-existent-index does not exist'}),
+    ('error', 'test-index', True, {'return_value': SERVER_ERROR_RESULT},
+     {'status': 'error', 'message': 'Failed to delete index test-index: Internal server error'}),
+    ('request_exception', 'test-index', True,
+     {'side_effect': requests.exceptions.RequestException("Connection error")},
+     {'status': 'error', 'message': 'Error deleting index test-index: Connection error'}),
+)
+
+# Headers _make_request sends with every request
+EXPECTED_JSON_HEADERS = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+
+# Static AWS credentials handed out by the patched boto3 session
+AWS_TEST_CREDENTIALS = SimpleNamespace(
+    access_key='test-access-key',
+    secret_key='test-secret-key',
+    token='test-token'
+)
+
+_session = Mock(spec_set=['get_credentials'])
+_session.get_credentials.return_value = AWS_TEST_CREDENTIALS
+_session_patcher = patch('boto3.Session', return_value=_session)
+
+def setUpModule():
+    """Patch boto3.Session once for every test in this module."""
+    _session_patcher.start()
+
+def tearDownModule():
+    """Restore boto3.Session after the last test in this module."""
+    _session_patcher.stop()
 
 class TestOpenSearchBaseManager(unittest.TestCase):
     """Test cases for the OpenSearchBaseManager class."""
     
-    @patch('requests.get')
-    def setUp(self, mock_get):
-        """Set up test environment."""
+    @classmethod
+    def setUpClass(cls):
+        """Start the connection patch and build the prototype manager once per class."""
         # Configure the mock to return a successful response for initialization
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_get.return_value = mock_response
-        
-        # Mock environment variables
-        self.env_patcher = patch.dict('os.environ', {
-            'OPENSEARCH_ENDPOINT': 'test-endpoint.com',
-            'AWS_REGION': 'us-east-1',
-            'VERIFY_SSL': 'false'
-        })
-        self.env_patcher.start()
-        
-        # Mock boto3 session and credentials
-        self.mock_session = MagicMock()
-        self.mock_credentials = MagicMock()
-        self.mock_credentials.access_key = 'test-access-key'
-        self.mock_credentials.secret_key = 'test-secret-key'
-        self.mock_credentials.token = 'test-token'
-        self.mock_session.get_credentials.return_value = self.mock_credentials
-        
-        self.session_patcher = patch('boto3.Session', return_value=self.mock_session)
-        self.session_patcher.start()
-        
-        # Create an instance of OpenSearchBaseManager
-        self.manager = OpenSearchBaseManager()
-        
-        # Store the mock_get for use in test methods
-        self.mock_get = mock_get
+        get_patcher = patch('requests.get', return_value=OK_RESPONSE)
+        cls.mock_get = get_patcher.start()
+        cls.addClassCleanup(get_patcher.stop)
+        
+        # Make every retry backoff instant; tests read the requested delays from mock_sleep
+        sleep_patcher = patch('time.sleep')
+        cls.mock_sleep = sleep_patcher.start()
+        cls.addClassCleanup(sleep_patcher.stop)
+        
+        # Patch the HTTP call behind _make_request; tests set its return value
+        request_patcher = patch('requests.request')
+        cls.mock_request = request_patcher.start()
+        cls.addClassCleanup(request_patcher.stop)
+        
+        # Shared method stubs, reset by _stub_index_exists and _stub_make_request before each use
+        cls.verify_index_exists = Mock()
+        cls.make_request = Mock()
+        
+        # Initialize the prototype manager; each test works on a shallow copy.
+        # The environment is only read here, so it is patched just for construction.
+        with patch.dict('os.environ', TEST_ENV):
+            cls.prototype = OpenSearchBaseManager()
     
-    def tearDown(self):
-        """Clean up after tests."""
-        self.env_patcher.stop()
-        self.session_patcher.stop()
+    def setUp(self):
+        """Copy the prototype so methods a test replaces do not leak into other tests."""
+        self.mock_get.reset_mock()
+        self.mock_sleep.reset_mock()
+        self.mock_request.reset_mock(return_value=True)
+        self.manager = copy.copy(self.prototype)
+    
+    def _stub_index_exists(self, exists):
+        """Point _verify_index_exists at the shared stub, reset to return exists."""
+        self.verify_index_exists.reset_mock()
+        self.verify_index_exists.return_value = exists
+        self.manager._verify_index_exists = self.verify_index_exists
+        return self.verify_index_exists
+    
+    def _stub_make_request(self, **config):
+        """Point _make_request at the shared stub, reset and configured with config."""
+        self.make_request.reset_mock(return_value=True, side_effect=True)
+        self.make_request.configure_mock(**config)
+        self.manager._make_request = self.make_request
+        return self.make_request
     
     def test_init_success(self):
         """Test successful initialization of OpenSearchBaseManager."""
@@ -62,75 +196,67 @@ class TestOpenSearchBaseManager(unittest.TestCase):
     
     def test_init_no_endpoint(self):
         """Test initialization without OpenSearch endpoint."""
-        # Create a clean environment without OPENSEARCH_ENDPOINT
-        with patch.dict('os.environ', {
-            'AWS_REGION': 'us-east-1',
-            'VERIFY_SSL': 'false'
-        }, clear=True):  # clear=True removes all other env vars
-            with self.assertRaises(ValueError) as context:
-                OpenSearchBaseManager()
-            self.assertEqual(str(context.exception), "OpenSearch endpoint is required")
+        # Unset only OPENSEARCH_ENDPOINT, which .env may have loaded, and restore it afterwards
+        endpoint = os.environ.pop('OPENSEARCH_ENDPOINT', None)
+        if endpoint is not None:
+            self.addCleanup(os.environ.__setitem__, 'OPENSEARCH_ENDPOINT', endpoint)
+        
+        with self.assertRaises(ValueError) as context:
+            OpenSearchBaseManager()
+        self.assertEqual(str(context.exception), "OpenSearch endpoint is required")
     
-    @patch('requests.request')
-    def test_make_request_success(self, mock_request):
+    def test_make_request_success(self):
         """Test successful request to OpenSearch."""
         # Mock successful response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {'acknowledged': True}
-        mock_response.raise_for_status.return_value = None
-        mock_request.return_value = mock_response
+        mock_response = _FakeResponse(payload={'acknowledged': True})
+        self.mock_request.return_value = mock_response
         
         result = self.manager._make_request('GET', '/test-index')
         
-        self.assertEqual(result['status'], 'success')
-        self.assertEqual(result['message'], 'Request completed successfully')
-        self.assertEqual(result['response'], mock_response)
+        self.assertEqual(result, {
+            'status': 'success',
+            'message': 'Request completed successfully',
+            'response': mock_response
+        })
     
-    @patch('requests.request')
-    def test_make_request_with_data(self, mock_request):
+    def test_make_request_with_data(self):
         """Test request with data payload."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status.return_value = None
-        mock_request.return_value = mock_response
+        self.mock_request.return_value = OK_RESPONSE
         
         data = {'query': {'match_all': {}}}
         result = self.manager._make_request('POST', '/test-index/_search', data=data)
         
-        self.assertEqual(result['status'], 'success')
-        mock_request.assert_called_once_with(
+        self.assertEqual(result, {
+            'status': 'success',
+            'message': 'Request completed successfully',
+            'response': OK_RESPONSE
+        })
+        self.mock_request.assert_called_once_with(
             method='POST',
             url='https://test-endpoint.com/test-index/_search',
-            headers={
-                'Content-Type': 'application/json',
-                'Accept': 'application/json'
-            },
+            headers=EXPECTED_JSON_HEADERS,
             json=data,
             auth=ANY,
             verify=False
         )
     
-    @patch('requests.request')
-    def test_make_request_with_non_dict_data(self, mock_request):
+    def test_make_request_with_non_dict_data(self):
         """Test request with non-dictionary data payload."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status.return_value = None
-        mock_request.return_value = mock_response
+        self.mock_request.return_value = OK_RESPONSE
         
         # Use a string as data (non-dictionary)
         data = '{"query": {"match_all": {}}}'
         result = self.manager._make_request('POST', '/test-index/_search', data=data)
         
-        self.assertEqual(result['status'], 'success')
-        mock_request.assert_called_once_with(
+        self.assertEqual(result, {
+            'status': 'success',
+            'message': 'Request completed successfully',
+            'response': OK_RESPONSE
+        })
+        self.mock_request.assert_called_once_with(
             method='POST',
             url='https://test-endpoint.com/test-index/_search',
-            headers={
-                'Content-Type': 'application/json',
-                'Accept': 'application/json'
-            },
+            headers=EXPECTED_JSON_HEADERS,
             data=data,  # Should use data parameter, not json
             auth=ANY,
             verify=False
@@ -138,13 +264,9 @@ class TestOpenSearchBaseManager(unittest.TestCase):
     
     def test_verify_index_exists_true(self):
         """Test index existence verification when index exists."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.raise_for_status.return_value = None
-        
-        self.manager._make_request = MagicMock(return_value={
+        self._stub_make_request(return_value={
             'status': 'success',
-            'response': mock_response
+            'response': OK_RESPONSE
         })
         
         result = self.manager._verify_index_exists('test-index')
@@ -154,7 +276,7 @@ class TestOpenSearchBaseManager(unittest.TestCase):
     
     def test_verify_index_exists_false(self):
         """Test index existence verification when index does not exist."""
-        self.manager._make_request = MagicMock(return_value={
+        self._stub_make_request(return_value={
             'status': 'error',
             'message': 'Index does not exist'
         })
@@ -165,14 +287,9 @@ class TestOpenSearchBaseManager(unittest.TestCase):
     
     def test_get_index_count_success(self):
         """Test getting document count from an index."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {'count': 100}
-        mock_response.raise_for_status.return_value = None
-        
-        self.manager._make_request = MagicMock(return_value={
+        self._stub_make_request(return_value={
             'status': 'success',
-            'response': mock_response
+            'response': COUNT_RESPONSE
         })
         
         count = self.manager._get_index_count('test-index')
@@ -182,7 +299,7 @@ class TestOpenSearchBaseManager(unittest.TestCase):
     
     def test_get_index_count_error(self):
         """Test getting document count when request fails."""
-        self.manager._make_request = MagicMock(return_value={
+        self._stub_make_request(return_value={
             'status': 'error',
             'message': 'Error getting count'
         })
@@ -193,18 +310,10 @@ class TestOpenSearchBaseManager(unittest.TestCase):
     
     def test_check_index_aliases_success(self):
         """Test checking index aliases when aliases exist."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = [
-            {'alias': 'alias1', 'index': 'test-index'},
-            {'alias': 'alias2', 'index': 'test-index'}
-        ]
-        mock_response.raise_for_status.return_value = None
-        
-        self.manager._verify_index_exists = MagicMock(return_value=True)
-        self.manager._make_request = MagicMock(return_value={
+        self._stub_index_exists(True)
+        self._stub_make_request(return_value={
             'status': 'success',
-            'response': mock_response
+            'response': CAT_ALIASES_RESPONSE
         })
         
         aliases = self.manager._check_index_aliases('test-index')
@@ -215,15 +324,10 @@ class TestOpenSearchBaseManager(unittest.TestCase):
     
     def test_check_index_aliases_no_aliases(self):
         """Test checking index aliases when no aliases exist."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = []
-        mock_response.raise_for_status.return_value = None
-        
-        self.manager._verify_index_exists = MagicMock(return_value=True)
-        self.manager._make_request = MagicMock(return_value={
+        self._stub_index_exists(True)
+        self._stub_make_request(return_value={
             'status': 'success',
-            'response': mock_response
+            'response': NO_ALIASES_RESPONSE
         })
         
         aliases = self.manager._check_index_aliases('test-index')
@@ -232,430 +336,51 @@ class TestOpenSearchBaseManager(unittest.TestCase):
     
     def test_delete_all_documents_success(self):
         """Test successful deletion of all documents from an index."""
-        mock_delete_response = MagicMock()
-        mock_delete_response.status_code = 200
-        mock_delete_response.json.return_value = {'deleted': 100}
-        mock_delete_response.raise_for_status.return_value = None
-        
-        mock_merge_response = MagicMock()
-        mock_merge_response.status_code = 200
-        mock_merge_response.raise_for_status.return_value = None
-        
-        self.manager._make_request = MagicMock(side_effect=[
-            {
-                'status': 'success',
-                'response': mock_delete_response
-            },
-            {
-                'status': 'success',
-                'response': mock_merge_response
-            }
-        ])
+        self._stub_make_request(side_effect=_success_results(DELETE_BY_QUERY_RESPONSE, OK_RESPONSE))
         
         result = self.manager._delete_all_documents('test-index')
         
-        self.assertEqual(result['status'], 'success')
-        self.assertEqual(result['documents_deleted'], 100)
-        self.assertEqual(self.manager._make_request.call_count, 2)
-    
-    def test_get_index_settings_error(self):
-        """Test error handling when getting index settings."""
-        # Mock the _make_request method
-        self.manager._make_request = MagicMock(return_value={
-            'status': 'error',
-            'response': MagicMock(
-                status_code=500,
-                text='Internal server error'
-            )
-        })
-        
-        # Test data
-        index_name = 'test-index'
-        
-        # Get index settings
-        result = self.manager.get_index_settings(index_name)
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'error')
-        self.assertEqual(result['message'], 'Failed to get index settings: Internal server error')
-        
-        # Verify that _make_request was called with the correct parameters
-        self.manager._make_request.assert_called_with(
-            'GET',
-            '/test-index/_settings'
-        )
-    
-    def test_get_index_settings_success(self):
-        """Test successful retrieval of index settings."""
-        # Mock the _make_request method
-        self.manager._make_request = MagicMock(return_value={
+        self.assertEqual(result, {
             'status': 'success',
-            'response': MagicMock(
-                status_code=200,
-                json=lambda: {
-                    'test-index': {
-                        'settings': {
-                            'index': {
-                                'number_of_shards': '1',
-                                'number_of_replicas': '1'
-                            }
-                        }
-                    }
-                }
-            )
+            'message': 'Deleted 100 documents',
+            'documents_deleted': 100
         })
-        
-        # Test data
-        index_name = 'test-index'
-        
-        # Get index settings
-        result = self.manager.get_index_settings(index_name)
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'success')
-        self.assertEqual(result['message'], 'Index settings retrieved successfully')
-        self.assertIn('response', result)
-        
-        # Verify that _make_request was called with the correct parameters
-        self.manager._make_request.assert_called_with(
-            'GET',
-            '/test-index/_settings'
-        )
+        self.assertEqual(self.manager._make_request.call_args_list, [
+            call('POST', '/test-index/_delete_by_query', data={'query': {'match_all': {}}}),
+            call('POST', '/test-index/_forcemerge')
+        ])
     
-    def test_get_index_settings_not_found(self):
-        """Test getting settings for a non-existent index."""
-        # Mock the _make_request method
-        self.manager._make_request = MagicMock(return_value={
-            'status': 'success',
-            'response': MagicMock(
-                status_code=404,
-                json=lambda: {'error': {'type': 'index_not_found_exception'}}
-            )
-        })
-        
-        # Test data
-        index_name = 'non-existent-index'
-        
-        # Get index settings
-        result = self.manager.get_index_settings(index_name)
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'error')
-        self.assertEqual(result['message'], 'Index does not exist')
-        self.assertIn('response', result)
-        
-        # Verify that _make_request was called with the correct parameters
-        self.manager._make_request.assert_called_with(
-            'GET',
-            '/non-existent-index/_settings'
-        )
+    def test_get_index_resources(self):
+        """Test the settings, mappings and aliases getters on success and on each failure."""
+        for scenario, method_name, index_name, request_config, expected_result, expected_path in GET_INDEX_SCENARIOS:
+            with self.subTest(scenario=scenario):
+                self._stub_make_request(**request_config)
+                
+                result = getattr(self.manager, method_name)(index_name)
+                
+                # Verify the result and the single GET it was built from
+                self.assertEqual(result, expected_result)
+                self.manager._make_request.assert_called_once_with('GET', expected_path)
     
-    def test_get_index_settings_exception(self):
-        """Test exception handling when getting index settings."""
-        # Mock the _make_request method to raise an exception
-        self.manager._make_request = MagicMock(side_effect=Exception("Test exception"))
-        
-        # Test data
-        index_name = 'test-index'
-        
-        # Get index settings
-        result = self.manager.get_index_settings(index_name)
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'error')
-        self.assertEqual(result['message'], 'Error getting index settings: Test exception')
-        
-        # Verify that _make_request was called with the correct parameters
-        self.manager._make_request.assert_called_with(
-            'GET',
-            '/test-index/_settings'
-        )
-
-    def test_bulk_index_success(self):
-        """Test successful bulk indexing of documents."""
-        # This test is no longer applicable as the bulk_index method has been removed
-        pass
-
-    def test_bulk_index_error(self):
-        """Test bulk indexing when the operation fails."""
-        # This test is no longer applicable as the bulk_index method has been removed
-        pass
-
-    def test_delete_index_success(self):
-        """Test successful deletion of an index."""
-        # Mock the _verify_index_exists method to return True
-        self.manager._verify_index_exists = MagicMock(return_value=True)
-        
-        # Mock the _make_request method
-        self.manager._make_request = MagicMock(return_value={
-            'status': 'success',
-            'response': MagicMock(
-                status_code=200,
-                text='{"acknowledged": true}'
-            )
-        })
-        
-        # Test data
-        index_name = 'test-index'
-        
-        # Perform deletion
-        result = self.manager._delete_index(index_name)
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'success')
-        self.assertEqual(result['message'], 'Successfully deleted index test-index')
-        
-        # Verify that _make_request was called with the correct parameters
-        self.manager._make_request.assert_called_with(
-            'DELETE',
-            '/test-index'
-        )
-
-    def test_delete_index_not_exists(self):
-        """Test deletion of a non-existent index."""
-        # Mock the _verify_index_exists method to return False
-        self.manager._verify_index_exists = MagicMock(return_value=False)
-        
-        # Mock the _make_request method
-        self.manager._make_request = MagicMock()
-        
-        # Test data
-        index_name = 'non-existent-index'
-        
-        # Perform deletion
-        result = self.manager._delete_index(index_name)
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'warning')
-        self.assertEqual(result['message'], 'Index non-existent-index does not exist')
-        
-        # Verify that _make_request was not called with DELETE
-        self.manager._make_request.assert_not_called()
-
-    def test_delete_index_error(self):
-        """Test deleting an index when the operation fails."""
-        # Mock the _verify_index_exists method to return True
-        self.manager._verify_index_exists = MagicMock(return_value=True)
-        
-        # Create a response mock with proper text attribute
-        response_mock = MagicMock()
-        response_mock.status_code = 500
-        response_mock.text = 'Internal server error'
-        
-        # Mock the _make_request method
-        self.manager._make_request = MagicMock(return_value={
-            'status': 'error',
-            'response': response_mock
-        })
-        
-        # Test data
-        index_name = 'test-index'
-        
-        # Perform deletion
-        result = self.manager._delete_index(index_name)
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'error')
-        self.assertEqual(result['message'], 'Failed to delete index test-index: Internal server error')
-        
-        # Verify that _make_request was called with the correct parameters
-        self.manager._make_request.assert_called_with(
-            'DELETE',
-            '/test-index'
-        )
-
-    def test_get_index_mappings_success(self):
-        """Test successful retrieval of index mappings."""
-        # Mock the _make_request method
-        self.manager._make_request = MagicMock(return_value={
-            'status': 'success',
-            'response': MagicMock(
-                status_code=200,
-                json=lambda: {
-                    'test-index': {
-                        'mappings': {
-                            'properties': {
-                                'field1': {'type': 'keyword'},
-                                'field2': {'type': 'text'}
-                            }
-                        }
-                    }
-                }
-            )
-        })
-        
-        # Test data
-        index_name = 'test-index'
-        
-        # Perform get
-        result = self.manager._get_index_mappings(index_name)
-        
-        # Verify the result
-        self.assertEqual(result, {
-            'properties': {
-                'field1': {'type': 'keyword'},
-                'field2': {'type': 'text'}
-            }
-        })
-        
-        # Verify that _make_request was called with the correct parameters
-        self.manager._make_request.assert_called_with(
-            'GET',
-            '/test-index/_mapping'
-        )
-
-    def test_get_index_mappings_not_exists(self):
-        """Test getting mappings for a non-existent index."""
-        # Mock the _make_request method
-        self.manager._make_request = MagicMock(return_value={
-            'status': 'error',
-            'response': MagicMock(
-                status_code=404,
-                json=lambda: {'error': {'type': 'index_not_found_exception'}}
-            )
-        })
-        
-        # Test data
-        index_name = 'non-existent-index'
-        
-        # Perform get
-        result = self.manager._get_index_mappings(index_name)
-        
-        # Verify the result
-        self.assertEqual(result, {})
-        
-        # Verify that _make_request was called with the correct parameters
-        self.manager._make_request.assert_called_with(
-            'GET',
-            '/non-existent-index/_mapping'
-        )
-
-    def test_get_index_mappings_error(self):
-        """Test getting mappings when the operation fails."""
-        # Mock the _make_request method
-        self.manager._make_request = MagicMock(return_value={
-            'status': 'error',
-            'response': MagicMock(
-                status_code=500,
-                text='Internal server error'
-            )
-        })
-        
-        # Test data
-        index_name = 'test-index'
-        
-        # Perform get
-        result = self.manager._get_index_mappings(index_name)
-        
-        # Verify the result
-        self.assertEqual(result, {})
-        
-        # Verify that _make_request was called with the correct parameters
-        self.manager._make_request.assert_called_with(
-            'GET',
-            '/test-index/_mapping'
-        )
-
-    def test_get_index_aliases_success(self):
-        """Test successful retrieval of index aliases."""
-        # Mock the _make_request method
-        self.manager._make_request = MagicMock(return_value={
-            'status': 'success',
-            'response': MagicMock(
-                status_code=200,
-                json=lambda: {
-                    'test-index': {
-                        'aliases': {
-                            'alias1': {},
-                            'alias2': {}
-                        }
-                    }
-                }
-            )
-        })
-        
-        # Test data
-        index_name = 'test-index'
-        
-        # Perform get
-        result = self.manager._get_index_aliases(index_name)
-        
-        # Verify the result
-        self.assertEqual(result, ['alias1', 'alias2'])
-        
-        # Verify that _make_request was called with the correct parameters
-        self.manager._make_request.assert_called_with(
-            'GET',
-            '/test-index/_alias'
-        )
-
-    def test_get_index_aliases_not_exists(self):
-        """Test getting aliases for a non-existent index."""
-        # Mock the _make_request method
-        self.manager._make_request = MagicMock(return_value={
-            'status': 'error',
-            'response': MagicMock(
-                status_code=404,
-                json=lambda: {'error': {'type': 'index_not_found_exception'}}
-            )
-        })
-        
-        # Test data
-        index_name = 'non-existent-index'
-        
-        # Perform get
-        result = self.manager._get_index_aliases(index_name)
-        
-        # Verify the result
-        self.assertEqual(result, [])
-        
-        # Verify that _make_request was called with the correct parameters
-        self.manager._make_request.assert_called_with(
-            'GET',
-            '/non-existent-index/_alias'
-        )
-
-    def test_get_index_aliases_error(self):
-        """Test getting aliases when the operation fails."""
-        # Mock the _make_request method
-        self.manager._make_request = MagicMock(return_value={
-            'status': 'error',
-            'response': MagicMock(
-                status_code=500,
-                text='Internal server error'
-            )
-        })
-        
-        # Test data
-        index_name = 'test-index'
-        
-        # Perform get
-        result = self.manager._get_index_aliases(index_name)
-        
-        # Verify the result
-        self.assertEqual(result, [])
-        
-        # Verify that _make_request was called with the correct parameters
-        self.manager._make_request.assert_called_with(
-            'GET',
-            '/test-index/_alias'
-        )
+    def test_delete_index(self):
+        """Test index deletion on success, for a missing index and on each failure."""
+        for scenario, index_name, index_exists, request_config, expected_result in DELETE_INDEX_SCENARIOS:
+            with self.subTest(scenario=scenario):
+                self._stub_index_exists(index_exists)
+                self._stub_make_request(**request_config)
+                
+                result = self.manager._delete_index(index_name)
+                
+                # Verify the result; DELETE is only sent for an existing index
+                self.assertEqual(result, expected_result)
+                expected_calls = [call('DELETE', f'/{index_name}')] if index_exists else []
+                self.assertEqual(self.manager._make_request.call_args_list, expected_calls)
 
     @patch('requests.get')
-    @patch('time.sleep')
-    def test_test_connection_retry_success(self, mock_sleep, mock_get):
+    def test_test_connection_retry_success(self, mock_get):
         """Test that _test_connection retries on failure and succeeds eventually."""
-        # Configure mock responses
-        mock_success = MagicMock()
-        mock_success.status_code = 200
-        mock_success.raise_for_status.return_value = None
-        
         # Configure mock to fail twice and then succeed
-        mock_get.side_effect = [
-            requests.exceptions.ConnectionError("Connection error"),
-            requests.exceptions.ConnectionError("Connection error"),
-            mock_success
-        ]
+        mock_get.side_effect = (CONNECTION_ERROR, CONNECTION_ERROR, OK_RESPONSE)
         
         # Call the method directly
         self.manager._test_connection()
@@ -663,21 +388,14 @@ class TestOpenSearchBaseManager(unittest.TestCase):
         # Verify that get was called 3 times
         self.assertEqual(mock_get.call_count, 3)
         
-        # Verify that sleep was called twice with exponential backoff
-        self.assertEqual(mock_sleep.call_count, 2)
-        mock_sleep.assert_any_call(1)  # First retry: 2^0 = 1 second
-        mock_sleep.assert_any_call(2)  # Second retry: 2^1 = 2 seconds
+        # Verify that sleep was called twice with exponential backoff: 2^0 then 2^1 seconds
+        self.assertEqual(self.mock_sleep.call_args_list, [call(1), call(2)])
     
     @patch('requests.get')
-    @patch('time.sleep')
-    def test_test_connection_all_retries_fail(self, mock_sleep, mock_get):
+    def test_test_connection_all_retries_fail(self, mock_get):
         """Test that _test_connection raises an exception after all retries fail."""
         # Configure mock to fail all three times
-        mock_get.side_effect = [
-            requests.exceptions.ConnectionError("Connection error"),
-            requests.exceptions.ConnectionError("Connection error"),
-            requests.exceptions.ConnectionError("Connection error")
-        ]
+        mock_get.side_effect = (CONNECTION_ERROR,) * 3
         
         # Expect an OpenSearchException to be raised
         with self.assertRaises(OpenSearchException) as context:
@@ -689,41 +407,13 @@ class TestOpenSearchBaseManager(unittest.TestCase):
         # Verify that get was called 3 times
         self.assertEqual(mock_get.call_count, 3)
         
-        # Verify that sleep was called twice with exponential backoff
-        self.assertEqual(mock_sleep.call_count, 2)
-        mock_sleep.assert_any_call(1)  # First retry: 2^0 = 1 second
-        mock_sleep.assert_any_call(2)  # Second retry: 2^1 = 2 seconds
-
-    def test_delete_index_request_exception(self):
-        """Test deleting an index when a request exception occurs."""
-        # Mock the _verify_index_exists method to return True
-        self.manager._verify_index_exists = MagicMock(return_value=True)
-        
-        # Mock the _make_request method to raise a RequestException
-        self.manager._make_request = MagicMock(side_effect=requests.exceptions.RequestException("Connection error"))
-        
-        # Test data
-        index_name = 'test-index'
-        
-        # Perform deletion
-        result = self.manager._delete_index(index_name)
-        
-        # Verify the result
-        self.assertEqual(result['status'], 'error')
-        self.assertEqual(result['message'], 'Error deleting index test-index: Connection error')
-        
-        # Verify that _make_request was called with the correct parameters
-        self.manager._make_request.assert_called_with(
-            'DELETE',
-            '/test-index'
-        )
+        # Verify that sleep was called twice with exponential backoff: 2^0 then 2^1 seconds
+        self.assertEqual(self.mock_sleep.call_args_list, [call(1), call(2)])
 
     def test_log_request_error(self):
         """Test error logging functionality."""
         # Create a mock exception with response attributes
-        mock_response = MagicMock()
-        mock_response.text = "Error response text"
-        mock_response.headers = {"content-type": "application/json"}
+        mock_response = _FakeResponse(text="Error response text", headers={"content-type": "application/json"})
         
         mock_exception = MagicMock()
         mock_exception.response = mock_response
@@ -766,8 +456,7 @@ class TestOpenSearchBaseManager(unittest.TestCase):
         """Test connection error logging with response text."""
         with patch('opensearch_base_manager.logger') as mock_logger:
             # Create a mock response with text
-            mock_response = MagicMock()
-            mock_response.text = "Error response text"
+            mock_response = _FakeResponse(text="Error response text")
             
             # Create an exception with response attribute
             exception = Exception("Connection failed")
@@ -780,6 +469,3 @@ class TestOpenSearchBaseManager(unittest.TestCase):
                 call("Error connecting to OpenSearch (Attempt 1/3): Connection failed"),
                 call("Response text: Error response text")
             ])
-
-if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file